@@ -0,0 +1,68 @@
+"""Compares bytes on the wire and CPU time of request body encodings, for
+bulk POST payloads of typical Eve documents.
+
+    $ PYTHONPATH=. python benchmarks/compression.py [documents]
+"""
+
+import json
+import random
+import sys
+import time
+
+from eve_requests.compression import ENCODINGS, compress
+
+LEVELS = {"gzip": (1, 6, 9), "deflate": (1, 6), "zstd": (1, 3, 10)}
+
+
+def payload(count):
+    rnd = random.Random(42)
+    documents = [
+        {
+            "firstname": rnd.choice(["john", "jane", "mary", "mark", "anna"]),
+            "lastname": "doe-%d" % rnd.randint(0, 10**6),
+            "email": "user%d@example.com" % rnd.randint(0, 10**6),
+            "age": rnd.randint(18, 90),
+            "score": rnd.random(),
+            "tags": rnd.sample(["a", "b", "c", "d", "e", "f"], 3),
+            "address": {
+                "street": "%d Main Street" % rnd.randint(1, 999),
+                "city": rnd.choice(["Rome", "Milan", "Paris", "Berlin"]),
+            },
+        }
+        for _ in range(count)
+    ]
+    return json.dumps(documents).encode("utf-8")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    data = payload(count)
+    print("{0} documents, {1} bytes uncompressed".format(count, len(data)))
+    print(
+        "{0:<10} {1:>5} {2:>12} {3:>7} {4:>10} {5:>10}".format(
+            "encoding", "level", "bytes", "ratio", "cpu ms", "MB/s"
+        )
+    )
+    for encoding in ENCODINGS:
+        for level in LEVELS[encoding]:
+            try:
+                start = time.process_time()
+                compressed = compress(data, encoding, level)
+                elapsed = time.process_time() - start
+            except ImportError:
+                print("{0:<10} (not installed)".format(encoding))
+                break
+            print(
+                "{0:<10} {1:>5} {2:>12} {3:>6.1%} {4:>10.1f} {5:>10.1f}".format(
+                    encoding,
+                    level,
+                    len(compressed),
+                    len(compressed) / len(data),
+                    elapsed * 1000,
+                    len(data) / 2**20 / elapsed if elapsed else float("inf"),
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
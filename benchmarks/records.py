@@ -0,0 +1,85 @@
+"""Compares memory usage and decoding speed of plain dicts and schema-derived
+records, either converted from decoded dicts or decoded straight into records
+by an ``object_pairs_hook``. Retained memory is what the documents take once
+decoded, peak memory what decoding them took.
+
+    $ PYTHONPATH=. python benchmarks/records.py [documents]
+"""
+
+import json
+import sys
+import time
+import tracemalloc
+
+from eve_requests.records import record_class, records_hook
+from eve_requests.utils import get_documents
+
+SCHEMA = {
+    "firstname": {"type": "string"},
+    "lastname": {"type": "string"},
+    "email": {"type": "string"},
+    "age": {"type": "integer"},
+    "score": {"type": "float"},
+    "active": {"type": "boolean"},
+    "tags": {"type": "list"},
+}
+
+
+def payload(count):
+    return json.dumps(
+        {
+            "_items": [
+                {
+                    "_id": "5b89b1b091a5d0000495f%03x" % (i % 4096),
+                    "_etag": "e%08x" % i,
+                    "_created": "Fri, 31 Aug 2018 21:22:56 GMT",
+                    "_updated": "Fri, 31 Aug 2018 21:22:56 GMT",
+                    "firstname": "john",
+                    "lastname": "doe %d" % i,
+                    "email": "john%d@example.com" % i,
+                    "age": i % 100,
+                    "score": i / 3.0,
+                    "active": bool(i % 2),
+                    "tags": [],
+                }
+                for i in range(count)
+            ]
+        }
+    )
+
+
+def measure(label, body, record=None, hook=None):
+    def decode():
+        return get_documents(
+            json.loads(body, object_pairs_hook=hook), record_class=record
+        )
+
+    # tracing slows decoding down, thus it is timed separately
+    start = time.perf_counter()
+    decode()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    documents = decode()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        "{0:<8} {1:>8.3f}s  retained {2:>8.1f} MiB  peak {3:>8.1f} MiB".format(
+            label, elapsed, current / 2**20, peak / 2**20
+        )
+    )
+    return documents
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    body = payload(count)
+    print("{0} documents".format(count))
+    measure("dicts", body)
+    record = record_class(SCHEMA)
+    measure("records", body, record)
+    measure("hook", body, hook=records_hook(record))
+
+
+if __name__ == "__main__":
+    main()
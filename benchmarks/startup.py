@@ -0,0 +1,58 @@
+"""Measures the cold import time of eve_requests, each run in a fresh
+interpreter, and fails if it exceeds a threshold.
+
+    $ PYTHONPATH=. python benchmarks/startup.py [--runs 30] [--threshold 15]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+TEMPLATE = """
+import time
+start = time.perf_counter()
+{0}
+print((time.perf_counter() - start) * 1000)
+"""
+
+
+def timed(statement, runs):
+    timings = []
+    for _ in range(runs):
+        output = subprocess.check_output(
+            [sys.executable, "-c", TEMPLATE.format(statement)]
+        )
+        timings.append(float(output))
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=30)
+    parser.add_argument(
+        "--threshold", type=float, default=15.0, help="maximum import time (ms)"
+    )
+    args = parser.parse_args()
+
+    statements = [
+        "import eve_requests",
+        "from eve_requests.utils import purge_document",
+        "from eve_requests import Client",
+    ]
+    results = [(statement, timed(statement, args.runs)) for statement in statements]
+    for statement, elapsed in results:
+        print("{0:<48} {1:>6.1f} ms".format(statement, elapsed))
+
+    elapsed = results[0][1]
+    if elapsed > args.threshold:
+        print(
+            "FAIL: import eve_requests took {0:.1f} ms (threshold {1:.1f} ms)".format(
+                elapsed, args.threshold
+            )
+        )
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Measures the cost of client-side validation for a bulk load.
+
+    $ PYTHONPATH=. python benchmarks/validation.py [documents]
+"""
+
+import sys
+import time
+
+from eve_requests.validation import Validator
+
+SCHEMA = {
+    "firstname": {"type": "string", "required": True, "maxlength": 50},
+    "lastname": {"type": "string", "required": True, "maxlength": 50},
+    "email": {"type": "string", "regex": r"[^@]+@[^@]+"},
+    "age": {"type": "integer", "min": 0, "max": 150},
+    "score": {"type": "float"},
+    "active": {"type": "boolean"},
+    "role": {"type": "string", "allowed": ["admin", "user"]},
+    "tags": {"type": "list", "schema": {"type": "string"}},
+    "address": {
+        "type": "dict",
+        "schema": {"city": {"type": "string"}, "zip": {"type": "string"}},
+    },
+}
+
+
+def documents(count):
+    return [
+        {
+            "firstname": "john",
+            "lastname": "doe %d" % i,
+            "email": "john%d@example.com" % i,
+            "age": i % 100,
+            "score": i / 3.0,
+            "active": bool(i % 2),
+            "role": "user",
+            "tags": ["a", "b"],
+            "address": {"city": "Rome", "zip": "00100"},
+        }
+        for i in range(count)
+    ]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    batch = documents(count)
+
+    start = time.perf_counter()
+    validator = Validator(SCHEMA)
+    compiled = time.perf_counter() - start
+
+    start = time.perf_counter()
+    invalid = sum(1 for document in batch if validator.validate(document))
+    elapsed = time.perf_counter() - start
+
+    print("compiled in {0:.3f}ms".format(compiled * 1000))
+    print(
+        "{0} documents in {1:.3f}s ({2:.1f}us per document), {3} invalid".format(
+            count, elapsed, elapsed / count * 10 ** 6, invalid
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
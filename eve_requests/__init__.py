@@ -1,4 +1,28 @@
+import importlib
+
 from .server import Settings
-from .client import Client
 
 __version__ = "0.0.1"
+
+__all__ = ["Client", "ReferenceResolver", "Session", "Settings"]
+
+# Names which pull in heavy dependencies (like requests and urllib3) are only
+# imported on first access, so that ``import eve_requests`` stays cheap.
+_LAZY_IMPORTS = {
+    "Client": ".client",
+    "ReferenceResolver": ".resolver",
+    "Session": ".session",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        module = importlib.import_module(_LAZY_IMPORTS[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError("module {0!r} has no attribute {1!r}".format(__name__, name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
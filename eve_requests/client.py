@@ -1,11 +1,23 @@
 # pylint: disable=C0330,W1401
-from urllib.parse import urljoin
+import functools
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from itertools import islice
+from urllib.parse import urljoin, urlsplit
 from requests import Request
 
 import requests
 
+from .compression import compress
+from .deadline import Deadline, DeadlineExceeded
+from .governor import OVERLOAD_STATUSES, parse_retry_after
+from .media import MultipartEncoder, stream_to
+from .records import Record, records_hook
 from .server import Settings
-from .utils import purge_document
+from .utils import purge_document, diff_document, submit_windowed
+from .validation import ValidationError, validator_for
 
 
 class Client:
@@ -26,19 +38,45 @@ class Client:
         >>> client.post('contacts', {"name": "john doe"}, auth=('user', 'pw'))
         <Response [201]>
 
+    Requests are sent through the session's transport adapters. A different
+    transport, like :class:`eve_requests.transports.WSGITransport`, can be
+    provided to run the client on another backend::
+
+        >>> client = Client(settings, transport=WSGITransport(app))
+
+    All methods sending requests accept a ``timeout`` argument, which is
+    passed on to Requests, and a ``deadline`` argument, a
+    :class:`eve_requests.deadline.Deadline` (or a number of seconds) bounding
+    the time spent on a whole operation, retries included::
+
+        >>> deadline = Deadline(5)
+        >>> for page in client.iter_pages('contacts', deadline=deadline):
+        ...     process(page)
+
     .. _Eve:
        http://python-eve.org/
     
     .. _Requests:
        http://python-requests.org/
 
+    :param settings: Optional :class:`Settings` instance.
+    :param transport: Optional :class:`requests.adapters.BaseAdapter`
+        instance used to send all requests, replacing the default
+        :class:`requests.adapters.HTTPAdapter`.
+    :param governor: Optional :class:`eve_requests.governor.Governor`
+        instance used to adapt concurrency and request rate to the remote
+        service.
     """
 
-    def __init__(self, settings=None):
+    def __init__(self, settings=None, transport=None, governor=None):
         #: Instance of :class:`requests.Session` used internally to perform
         #: HTTP requests.
         self.session = requests.Session()
 
+        if transport:
+            for prefix in ("https://", "http://"):
+                self.session.mount(prefix, transport)
+
         if settings:
             #: Remote service settings. Make sure these are properly set before
             #: invoking any of the read and write methods.
@@ -47,6 +85,60 @@ class Client:
         else:
             self.settings = Settings()
 
+        #: Optional :class:`eve_requests.governor.Governor` gating all
+        #: requests. Can be shared by several clients.
+        self.governor = governor
+
+        #: Optional encoding (``gzip``, ``deflate`` or ``zstd``) used to
+        #: compress request bodies larger than :attr:`compress_threshold`.
+        #: The remote service must be able to decode compressed requests,
+        #: which Eve does not do by itself (a WSGI middleware is needed).
+        #: Defaults to ``None`` (no compression).
+        self.compress = None
+
+        #: Minimum size, in bytes, of request bodies to be compressed.
+        #: Defaults to ``1024``.
+        self.compress_threshold = 1024
+
+        #: Optional compression level. See :func:`eve_requests.compression.compress`.
+        self.compress_level = None
+
+        #: Optional value of the ``Accept-Encoding`` header sent with every
+        #: request, like ``"gzip"`` or ``"identity"``. Defaults to ``None``,
+        #: which leaves the Requests default (``gzip, deflate``) in place.
+        self.accept_encoding = None
+
+        #: Optional :class:`eve_requests.traffic.Recorder` logging every
+        #: request sent.
+        self.recorder = None
+
+        #: Wether POST, PUT and PATCH payloads are validated against the
+        #: resource schema (see :any:`Settings.domain`) before they are sent.
+        #: Validators are compiled on first use and cached per endpoint.
+        #: Defaults to ``False``.
+        self.validate_payloads = False
+
+        self._profiler = None
+
+        self._validators = {}
+
+    @property
+    def profiler(self):
+        """Optional :class:`eve_requests.profiling.Profiler` collecting
+        statistics about each stage of the requests sent. Stages are only
+        instrumented while it is set."""
+        return self._profiler
+
+    @profiler.setter
+    def profiler(self, profiler):
+        self._profiler = profiler
+        for name, (stage, endpoint_index) in _PROFILED_METHODS.items():
+            if profiler is None:
+                self.__dict__.pop(name, None)
+            else:
+                method = getattr(type(self), name).__get__(self)
+                setattr(self, name, _profiled(profiler, stage, endpoint_index, method))
+
     def post(self, endpoint, payload, **kwargs):
         """Sends a POST request.
 
@@ -59,9 +151,12 @@ class Client:
             server’s response to an HTTP request.
         
         :raises ValueError: If :any:`settings` is not set.
+        :raises eve_requests.validation.ValidationError: If
+            :attr:`validate_payloads` is enabled and the payload is not valid.
         """
+        options = _send_options(kwargs)
         req = self._build_post_request(endpoint, payload, **kwargs)
-        return self._prepare_and_send_request(req)
+        return self._prepare_and_send_request(req, endpoint=endpoint, **options)
 
     def put(self, endpoint, payload, unique_id=None, etag=None, **kwargs):
         """Sends a PUT request.
@@ -85,13 +180,40 @@ class Client:
         :raises ValueError: If ETag is missing and :any:`Settings.if_match` is 
             enabled.
         :raises ValueError: If :any:`settings` is not set.
+        :raises eve_requests.validation.ValidationError: If
+            :attr:`validate_payloads` is enabled and the payload is not valid.
         """
+        options = _send_options(kwargs)
         req = self._build_put_request(endpoint, payload, unique_id, etag, **kwargs)
-        return self._prepare_and_send_request(req)
-
-    def patch(self, endpoint, payload, unique_id=None, etag=None, **kwargs):
+        return self._prepare_and_send_request(req, endpoint=endpoint, **options)
+
+    def patch(
+        self,
+        endpoint,
+        payload,
+        unique_id=None,
+        etag=None,
+        original=None,
+        remove_missing=False,
+        **kwargs
+    ):
         """Sends a PATCH request.
 
+        When ``original`` is provided, only the fields which differ from it
+        are sent over (see :func:`eve_requests.utils.diff_document`)::
+
+            >>> original = client.get('contacts', unique_id=id).json()
+            >>> document = copy.deepcopy(original)
+            >>> document['name'] = 'jane'
+            >>> client.patch('contacts', document, original=original)
+            <Response [200]>
+
+        ``payload`` can then hold only part of the fields; fields missing
+        from it are left untouched, unless ``remove_missing`` is set. If
+        nothing changed, no request is sent, so that the document's ETag and
+        update date are left untouched, and ``None`` is returned instead of a
+        response.
+
         :param endpoint: Target endpoint relative to the base URL of the
             remote service.
         :param payload: JSON data to send as the body of the request. If the
@@ -99,22 +221,37 @@ class Client:
             stripped before the request is sent over to the remote service.
         :param unique_id: Optional id of the document being updated on the
             remote service. If omitted, the id will be inferred from the
-            payload.
+            payload or, failing that, from ``original``.
         :param etag: Optional document ETag. If omitted, the ETag will be
-            inferred from the payload.
+            inferred from the payload or, failing that, from ``original``.
+        :param original: Optional snapshot of the document as it was last
+            fetched from the remote service. If present, a delta PATCH
+            request is sent.
+        :param remove_missing: Wether fields of ``original`` missing from
+            ``payload`` should be removed, by setting them to ``None``. The
+            remote service only accepts this for ``nullable`` fields.
         :param \*\*kwargs: Optional arguments that :obj:`requests.Request`
             takes.
 
         :returns: The :class:`requests.Response` object, which contains a 
-            server’s response to an HTTP request.
+            server’s response to an HTTP request. ``None`` if ``original`` is
+            provided and nothing changed: check for it before using the
+            response.
         
         :raises ValueError: If the unique id is missing.
         :raises ValueError: If ETag is missing and :any:`Settings.if_match` is 
             enabled.
         :raises ValueError: If :any:`settings` is not set.
+        :raises eve_requests.validation.ValidationError: If
+            :attr:`validate_payloads` is enabled and the payload is not valid.
         """
-        req = self._build_patch_request(endpoint, payload, unique_id, etag, **kwargs)
-        return self._prepare_and_send_request(req)
+        options = _send_options(kwargs)
+        req = self._build_patch_request(
+            endpoint, payload, unique_id, etag, original, remove_missing, **kwargs
+        )
+        if original is not None and not req.json:
+            return None
+        return self._prepare_and_send_request(req, endpoint=endpoint, **options)
 
     def delete(self, endpoint, etag, unique_id, payload=None, **kwargs):
         """Sends a DELETE request.
@@ -139,8 +276,9 @@ class Client:
             is enabled.
         :raises ValueError: If :any:`settings` is not set.
         """
+        options = _send_options(kwargs)
         req = self._build_delete_request(endpoint, payload, etag, unique_id, **kwargs)
-        return self._prepare_and_send_request(req)
+        return self._prepare_and_send_request(req, endpoint=endpoint, **options)
 
     def get(self, endpoint, etag=None, unique_id=None, payload=None, **kwargs):
         """Sends a GET request.
@@ -163,12 +301,236 @@ class Client:
             enabled.
         :raises ValueError: If :any:`settings` is not set.
         """
+        options = _send_options(kwargs)
         req = self._build_get_request(endpoint, etag, unique_id, payload, **kwargs)
-        return self._prepare_and_send_request(req)
+        return self._prepare_and_send_request(req, endpoint=endpoint, **options)
+
+    def bulk_post(self, endpoint, documents, batch_size=50, max_workers=8, **kwargs):
+        """Inserts documents in bulk, sending several POST requests
+        concurrently. Requires bulk inserts to be enabled on the remote
+        service (``BULK_ENABLED``).
+
+        Documents are consumed lazily and only a bounded number of batches is
+        kept in flight, so that arbitrarily large iterables can be inserted.
+        When :attr:`governor` is set, it decides how many requests are
+        actually sent at once.
+
+            >>> for batch, response in client.bulk_post('contacts', documents):
+            ...     response.raise_for_status()
+
+        :param endpoint: Target endpoint relative to the base URL of the
+            remote service.
+        :param documents: An iterable of documents.
+        :param batch_size: Number of documents per request.
+        :param max_workers: Maximum number of concurrent requests.
+        :param \*\*kwargs: Optional arguments that :obj:`requests.Request`
+            takes.
+        :returns: A generator of ``(batch, response)`` tuples, in input order.
+
+        :raises ValueError: If :any:`settings` is not set.
+        """
+        deadline = Deadline.of(kwargs.pop("deadline", None))
+        if deadline:
+            kwargs["deadline"] = deadline
+
+        def batches():
+            for batch in _batches(documents, batch_size):
+                if deadline:
+                    deadline.check()
+                yield batch
+
+        pending = deque()
+        with ThreadPoolExecutor(max_workers) as executor:
+            try:
+                for batch, future in submit_windowed(
+                    executor,
+                    functools.partial(self.post, endpoint, **kwargs),
+                    batches(),
+                    max_workers * 2,
+                    pending,
+                ):
+                    yield batch, future.result()
+            finally:
+                for _, future in pending:
+                    future.cancel()
+
+    def iter_pages(self, endpoint, max_results=None, record_class=None, **kwargs):
+        """Iterates over all the pages of a resource, sending a GET request
+        for each one of them. Iteration stops when the remote service does not
+        return a ``next`` link. If the service returns no links at all
+        (``HATEOAS`` is disabled), it stops after the last page according to
+        the ``total`` of the meta field, or, when that is missing too, after
+        the first page which is not full.
+
+            >>> for page in client.iter_pages('contacts', max_results=100):
+            ...     for contact in get_documents(page):
+            ...         print(contact['name'])
+
+        :param endpoint: Target endpoint relative to the base URL of the
+            remote service.
+        :param max_results: Optional page size. Should not exceed the remote
+            ``PAGINATION_LIMIT`` setting.
+        :param record_class: Optional
+            :class:`eve_requests.records.Record` subclass. Documents are then
+            decoded straight into its instances, without building dicts
+            for them (see :func:`eve_requests.records.records_hook`).
+        :param \*\*kwargs: Optional arguments that :obj:`requests.Request`
+            takes. A ``page`` parameter, if present, sets the first page.
+        :returns: A generator of decoded JSON pages.
+
+        :raises requests.HTTPError: If the remote service returns an error.
+        :raises ValueError: If :any:`settings` is not set.
+        """
+        params = dict(kwargs.pop("params", None) or {})
+        if max_results:
+            params["max_results"] = max_results
+        page = int(params.get("page", 1))
+        if "deadline" in kwargs:
+            kwargs["deadline"] = Deadline.of(kwargs["deadline"])
+        decode = {}
+        if record_class:
+            decode["object_pairs_hook"] = records_hook(record_class, self.settings)
+
+        while True:
+            params["page"] = page
+            response = self.get(endpoint, params=dict(params), **kwargs)
+            response.raise_for_status()
+            json = response.json(**decode)
+            yield json
+
+            links = json.get(self.settings.links)
+            if links is not None:
+                if "next" not in links:
+                    return
+            elif not _has_more_pages(
+                json, page, params.get("max_results"), self.settings
+            ):
+                return
+            page += 1
+
+    def post_media(self, endpoint, payload, files, callback=None, **kwargs):
+        """Sends a ``multipart/form-data`` POST request, streaming ``files``
+        to Eve media fields without loading them in memory.
+
+            >>> with open('avatar.png', 'rb') as f:
+            ...     client.post_media('contacts', {'name': 'john'}, {'avatar': f})
+            <Response [201]>
+
+        :param endpoint: Target endpoint relative to the base URL of the
+            remote service.
+        :param payload: Form data to send along the files.
+        :param files: Dict of media fields. Values are file-like objects
+            (open files, :obj:`mmap.mmap` instances, buffers) or
+            ``(filename, fileobj[, content_type])`` tuples.
+        :param callback: Optional callable invoked as ``callback(bytes_sent,
+            total_bytes)`` while the body is being sent.
+        :param \*\*kwargs: Optional arguments that :obj:`requests.Request`
+            takes.
+        :returns: The :class:`requests.Response` object, which contains a
+            server’s response to an HTTP request.
+
+        :raises ValueError: If :any:`settings` is not set.
+        """
+        options = _send_options(kwargs)
+        req = self._build_media_request(
+            "POST", endpoint, payload, files, callback=callback, **kwargs
+        )
+        return self._prepare_and_send_request(req, endpoint=endpoint, **options)
+
+    def put_media(
+        self,
+        endpoint,
+        payload,
+        files,
+        unique_id=None,
+        etag=None,
+        callback=None,
+        **kwargs
+    ):
+        """Sends a ``multipart/form-data`` PUT request, streaming ``files``
+        to Eve media fields without loading them in memory. See
+        :meth:`post_media` and :meth:`put`.
+
+        :raises ValueError: If the unique id is missing.
+        :raises ValueError: If ETag is missing and :any:`Settings.if_match` is
+            enabled.
+        :raises ValueError: If :any:`settings` is not set.
+        """
+        options = _send_options(kwargs)
+        req = self._build_media_request(
+            "PUT", endpoint, payload, files, unique_id, etag, callback, **kwargs
+        )
+        return self._prepare_and_send_request(req, endpoint=endpoint, **options)
+
+    def patch_media(
+        self,
+        endpoint,
+        payload,
+        files,
+        unique_id=None,
+        etag=None,
+        callback=None,
+        **kwargs
+    ):
+        """Sends a ``multipart/form-data`` PATCH request, streaming ``files``
+        to Eve media fields without loading them in memory. See
+        :meth:`post_media` and :meth:`patch`.
+
+        :raises ValueError: If the unique id is missing.
+        :raises ValueError: If ETag is missing and :any:`Settings.if_match` is
+            enabled.
+        :raises ValueError: If :any:`settings` is not set.
+        """
+        options = _send_options(kwargs)
+        req = self._build_media_request(
+            "PATCH", endpoint, payload, files, unique_id, etag, callback, **kwargs
+        )
+        return self._prepare_and_send_request(req, endpoint=endpoint, **options)
+
+    def download(
+        self, endpoint, destination, chunk_size=64 * 1024, callback=None, **kwargs
+    ):
+        """Streams a media file to ``destination``, one chunk at a time. Use
+        with services returning media as URLs (``RETURN_MEDIA_AS_URL``).
+
+            >>> contact = client.get('contacts', unique_id=id).json()
+            >>> client.download(contact['avatar'], 'avatar.png')
+            1048576
+
+        :param endpoint: Media URL or endpoint relative to the base URL of
+            the remote service.
+        :param destination: Either a file path or a writable file-like object.
+        :param chunk_size: Size of the chunks read from the network.
+        :param callback: Optional callable invoked as ``callback(bytes_written,
+            total_bytes)`` after every chunk.
+        :param \*\*kwargs: Optional arguments that :obj:`requests.Request`
+            takes.
+        :returns: The number of bytes written.
+
+        :raises requests.HTTPError: If the remote service returns an error.
+        :raises ValueError: If :any:`settings` is not set.
+        """
+        options = _send_options(kwargs)
+        req = self._build_get_request(endpoint, **kwargs)
+        response = self._prepare_and_send_request(
+            req, endpoint=endpoint, stream=True, **options
+        )
+        if not response.ok:
+            response.close()
+        response.raise_for_status()
+        return stream_to(response, destination, chunk_size, callback)
 
     def _build_post_request(self, endpoint, payload, **kwargs):
         self.__validate()
         url = self._resolve_url(endpoint)
+        if isinstance(payload, Record):
+            payload = payload.to_dict()
+        elif isinstance(payload, list):
+            payload = [
+                document.to_dict() if isinstance(document, Record) else document
+                for document in payload
+            ]
+        self._check_payload(endpoint, payload)
         return Client.__build_request("POST", url, json=payload, **kwargs)
 
     def _build_put_request(
@@ -177,16 +539,36 @@ class Client:
         self.__validate()
         url = self._resolve_url(endpoint, payload, unique_id, id_required=True)
         headers = self._resolve_ifmatch_header(payload, etag)
-        json = purge_document(payload)
+        with self._profile("purge"):
+            json = purge_document(payload)
+        self._check_payload(endpoint, json)
         return Client.__build_request("PUT", url, json=json, headers=headers, **kwargs)
 
     def _build_patch_request(
-        self, endpoint, payload, unique_id=None, etag=None, **kwargs
+        self,
+        endpoint,
+        payload,
+        unique_id=None,
+        etag=None,
+        original=None,
+        remove_missing=False,
+        **kwargs
     ):
         self.__validate()
+        if original is not None:
+            unique_id = unique_id or Client._resolve_field(
+                self.settings.id_field, payload, original
+            )
+            etag = etag or Client._resolve_field(self.settings.etag, payload, original)
         url = self._resolve_url(endpoint, payload, unique_id, id_required=True)
         headers = self._resolve_ifmatch_header(payload, etag)
-        json = purge_document(payload)
+        if original is not None:
+            with self._profile("diff"):
+                json = diff_document(original, payload, self.settings, remove_missing)
+        else:
+            with self._profile("purge"):
+                json = purge_document(payload)
+        self._check_payload(endpoint, json, update=True)
         return Client.__build_request(
             "PATCH", url, json=json, headers=headers, **kwargs
         )
@@ -212,6 +594,58 @@ class Client:
             headers = None
         return Client.__build_request("GET", url, headers=headers, **kwargs)
 
+    def _build_media_request(
+        self,
+        method,
+        endpoint,
+        payload,
+        files,
+        unique_id=None,
+        etag=None,
+        callback=None,
+        **kwargs
+    ):
+        self.__validate()
+        if method == "POST":
+            url = self._resolve_url(endpoint)
+            headers = {}
+        else:
+            url = self._resolve_url(endpoint, payload, unique_id, id_required=True)
+            headers = self._resolve_ifmatch_header(payload, etag) or {}
+        fields = None
+        if payload:
+            with self._profile("purge"):
+                fields = purge_document(payload, self.settings)
+        body = MultipartEncoder(
+            fields,
+            files,
+            callback=callback,
+            as_json=self.settings.multipart_form_fields_as_json,
+        )
+        headers["Content-Type"] = body.content_type
+        return Client.__build_request(method, url, data=body, headers=headers, **kwargs)
+
+    def _profile(self, stage, endpoint=None):
+        if self.profiler is None:
+            return _NOT_PROFILED
+        return self.profiler.stage(stage, endpoint)
+
+    def _check_payload(self, endpoint, payload, update=False):
+        if not self.validate_payloads:
+            return
+        validator = self._validators.get(endpoint)
+        if validator is None:
+            validator = validator_for(self.settings, endpoint)
+            self._validators[endpoint] = validator
+        if isinstance(payload, list):
+            issues = [validator.validate(document, update) for document in payload]
+            if any(issues):
+                raise ValidationError(issues)
+        else:
+            issues = validator.validate(payload, update)
+            if issues:
+                raise ValidationError(issues)
+
     def _resolve_url(self, endpoint, payload=None, unique_id=None, id_required=False):
         if unique_id:
             endpoint = "/".join([endpoint, unique_id])
@@ -223,6 +657,13 @@ class Client:
 
         return urljoin(self.settings.base_url, endpoint)
 
+    @staticmethod
+    def _resolve_field(field, *documents):
+        for document in documents:
+            if document and field in document:
+                return document[field]
+        return None
+
     def _resolve_if_none_match_header(self, payload=None, etag=None):
         return_value = self._resolve_etag(payload, etag)
         return {"If-None-Match": return_value} if return_value else None
@@ -242,9 +683,109 @@ class Client:
 
         raise ValueError("ETag is required")
 
-    def _prepare_and_send_request(self, request):
-        request = self.session.prepare_request(request)
-        return self.session.send(request)
+    def _prepare_and_send_request(
+        self, request, deadline=None, endpoint=None, **kwargs
+    ):
+        if self.profiler and endpoint is None:
+            endpoint = self._resolve_endpoint(request.url)
+        with self._profile("prepare", endpoint):
+            request = self.session.prepare_request(request)
+            self._encode_request(request)
+        with self._profile("send", endpoint):
+            response = self._record_and_send_request(request, deadline, **kwargs)
+        if self.profiler:
+            # JSON is decoded on demand
+            response.json = self.profiler.wrap("decode", endpoint, response.json)
+        return response
+
+    def _record_and_send_request(self, request, deadline=None, **kwargs):
+        if not self.recorder:
+            return self._send_request(request, deadline, **kwargs)
+
+        start = time.monotonic()
+        response = None
+        try:
+            response = self._send_request(request, deadline, **kwargs)
+            return response
+        finally:
+            self.recorder.record(
+                self,
+                request,
+                start,
+                time.monotonic() - start,
+                response.status_code if response is not None else None,
+            )
+
+    def _send_request(self, request, deadline=None, **kwargs):
+        if self.governor:
+            return self._send_governed_request(request, deadline, **kwargs)
+        if deadline:
+            kwargs["timeout"] = deadline.timeout(kwargs.get("timeout"))
+        return self.session.send(request, **kwargs)
+
+    def _encode_request(self, request):
+        if self.accept_encoding is not None:
+            request.headers["Accept-Encoding"] = self.accept_encoding
+
+        body = request.body
+        if (
+            self.compress
+            and isinstance(body, (bytes, str))
+            and len(body) >= self.compress_threshold
+            and "Content-Encoding" not in request.headers
+        ):
+            if isinstance(body, str):
+                body = body.encode("utf-8")
+            request.body = compress(body, self.compress, self.compress_level)
+            request.headers["Content-Encoding"] = self.compress
+            request.headers["Content-Length"] = str(len(request.body))
+
+    def _send_governed_request(self, request, deadline=None, **kwargs):
+        governor = self.governor
+        endpoint = self._resolve_endpoint(request.url)
+        # streamed bodies can't be sent twice
+        retries = governor.retries if _is_replayable(request.body) else 0
+        timeout = kwargs.get("timeout")
+
+        for attempt in range(retries + 1):
+            if deadline:
+                if not governor.acquire(endpoint, deadline.remaining):
+                    raise DeadlineExceeded("Deadline exceeded")
+                try:
+                    kwargs["timeout"] = deadline.timeout(timeout)
+                except DeadlineExceeded:
+                    governor.cancel(endpoint)
+                    raise
+            else:
+                governor.acquire(endpoint)
+            start = time.monotonic()
+            response = None
+            try:
+                response = self.session.send(request, **kwargs)
+            finally:
+                governor.release(
+                    endpoint,
+                    time.monotonic() - start,
+                    response.status_code if response is not None else None,
+                    (
+                        response.headers.get("Retry-After")
+                        if response is not None
+                        else None
+                    ),
+                )
+            if response.status_code not in OVERLOAD_STATUSES or attempt == retries:
+                return response
+            response.close()
+            if parse_retry_after(response.headers.get("Retry-After")) is None:
+                # Retry-After pauses the governor, otherwise back off here
+                delay = governor.retry_delay(attempt)
+                time.sleep(min(delay, deadline.remaining) if deadline else delay)
+
+    def _resolve_endpoint(self, url):
+        base_url = self.settings.base_url or ""
+        if url.startswith(base_url):
+            url = url[len(base_url) :]
+        return urlsplit(url).path.strip("/").split("/")[0]
 
     def __validate(self):
         if not self.settings:
@@ -253,3 +794,70 @@ class Client:
     @classmethod
     def __build_request(cls, method, url, json=None, headers=None, **kwargs):
         return Request(method, url, json=json, headers=headers, **kwargs)
+
+
+_NOT_PROFILED = nullcontext()
+
+# methods instrumented by the profiler, with their stage and the position of
+# their endpoint argument (if any; otherwise it is the enclosing stage's one)
+_PROFILED_METHODS = {
+    "_build_post_request": ("build", 0),
+    "_build_put_request": ("build", 0),
+    "_build_patch_request": ("build", 0),
+    "_build_delete_request": ("build", 0),
+    "_build_get_request": ("build", 0),
+    "_build_media_request": ("build", 1),
+    "_resolve_url": ("resolve_url", None),
+    "_resolve_etag": ("resolve_etag", None),
+}
+
+
+def _profiled(profiler, stage, endpoint_index, method):
+    def wrapper(*args, **kwargs):
+        endpoint = None
+        if endpoint_index is not None:
+            endpoint = (
+                args[endpoint_index]
+                if len(args) > endpoint_index
+                else kwargs.get("endpoint")
+            )
+        with profiler.stage(stage, endpoint):
+            return method(*args, **kwargs)
+
+    return wrapper
+
+
+def _batches(documents, size):
+    iterator = iter(documents)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _has_more_pages(json, page, max_results, settings):
+    meta = json.get(settings.meta) or {}
+    max_results = meta.get("max_results") or max_results
+    if "total" in meta and max_results:
+        return meta.get("page", page) * max_results < meta["total"]
+    documents = json.get(settings.items) or ()
+    if max_results:
+        return len(documents) >= max_results
+    return bool(documents)
+
+
+def _is_replayable(body):
+    return body is None or isinstance(body, (bytes, str))
+
+
+def _send_options(kwargs):
+    # options which apply to sending requests, rather than building them
+    options = {
+        option: kwargs.pop(option)
+        for option in ("timeout", "deadline")
+        if option in kwargs
+    }
+    if "deadline" in options:
+        options["deadline"] = Deadline.of(options["deadline"])
+    return options
@@ -0,0 +1,210 @@
+import json
+from array import array
+from datetime import datetime, timezone
+
+from .server import Settings
+from .utils import get_documents
+
+#: Maps Eve schema types to :mod:`array` type codes. Fields of any other
+#: type are stored in plain lists.
+TYPE_CODES = {
+    "integer": "q",
+    "float": "d",
+    "number": "d",
+    "boolean": "b",
+    "datetime": "q",
+}
+
+
+class Columns:
+    """Accumulates documents column by column. Numeric, boolean and datetime
+    fields are stored in compact :class:`array.array` buffers, all other
+    fields in lists. Datetime values are stored as milliseconds since the
+    epoch.
+
+    Each column comes with a validity mask, a :class:`bytearray` holding
+    ``1`` where the document had a (non-null) value for the field and ``0``
+    where it did not. Missing values are stored as ``0`` in array columns
+    and as ``None`` in list columns.
+
+        >>> columns = Columns({'age': 'integer', 'born': 'datetime'})
+        >>> columns.extend(get_documents(r.json()))
+        >>> columns['age']
+        array('q', [32, 0, 41])
+        >>> columns.masks['age']
+        bytearray(b'\\x01\\x00\\x01')
+
+    :param types: Optional dict mapping field names to Eve schema types
+        (``integer``, ``float``, ``number``, ``boolean``, ``datetime``).
+        Meta date fields are typed automatically.
+    :param fields: Optional list of fields to collect. If omitted, every
+        field found in the documents gets its own column.
+    :param settings: Optional :any:`Settings` instance to be used while
+        processing documents.
+    """
+
+    def __init__(self, types=None, fields=None, settings=None):
+        if not settings:
+            settings = Settings()
+        self.settings = settings
+
+        #: Field type map, from field names to Eve schema types.
+        self.types = {settings.created: "datetime", settings.updated: "datetime"}
+        self.types.update(types or {})
+
+        #: Number of documents collected so far.
+        self.count = 0
+
+        #: Validity masks, keyed by field name.
+        self.masks = {}
+
+        self._columns = {}
+        self._fixed = fields is not None
+        self._frozen = False
+        for field in fields or ():
+            self._add_column(field)
+
+    def __getitem__(self, field):
+        return self._columns[field]
+
+    def __contains__(self, field):
+        return field in self._columns
+
+    def __iter__(self):
+        return iter(self._columns)
+
+    def __len__(self):
+        return len(self._columns)
+
+    def append(self, document):
+        """Appends a document to the columns.
+
+        :raises ValueError: If the columns were frozen by :meth:`to_numpy`.
+        """
+        if self._frozen:
+            raise ValueError(
+                "Columns are shared with NumPy arrays and can't be appended to"
+            )
+        if not self._fixed:
+            for field in document:
+                if field not in self._columns:
+                    self._add_column(field)
+
+        for field, column in self._columns.items():
+            value = document.get(field)
+            mask = self.masks[field]
+            if value is None:
+                column.append(0 if isinstance(column, array) else None)
+                mask.append(0)
+                continue
+            if self.types.get(field) == "datetime":
+                value = self._timestamp(value)
+            column.append(value)
+            mask.append(1)
+
+        self.count += 1
+
+    def extend(self, documents):
+        """Appends several documents to the columns."""
+        for document in documents:
+            self.append(document)
+
+    def to_dict(self):
+        """Returns the columns as a dict, keyed by field name."""
+        return dict(self._columns)
+
+    def to_numpy(self, copy=False):
+        """Returns the columns as a dict of NumPy_ arrays, keyed by field name.
+        Datetime columns become ``datetime64[ms]`` arrays and list columns
+        become object arrays.
+
+        Unless ``copy`` is set, array columns are converted without copying,
+        so the NumPy arrays share their memory. The columns are then frozen:
+        no more documents can be appended to them.
+
+        .. _NumPy:
+           http://www.numpy.org/
+
+        :param copy: Wether array columns should be copied, leaving the
+            columns open to more documents.
+
+        :raises ImportError: If NumPy is not installed.
+        """
+        import numpy  # pylint: disable=import-outside-toplevel
+
+        result = {}
+        for field, column in self._columns.items():
+            if not isinstance(column, array):
+                values = numpy.empty(len(column), dtype=object)
+                values[:] = column
+                result[field] = values
+                continue
+            if column.typecode == "b":
+                values = numpy.frombuffer(column, dtype=numpy.int8).view(bool)
+            else:
+                values = numpy.frombuffer(column, dtype=column.typecode)
+                if self.types.get(field) == "datetime":
+                    values = values.view("datetime64[ms]")
+            if copy:
+                values = values.copy()
+            else:
+                # array buffers can't be resized while they are exported
+                self._frozen = True
+            result[field] = values
+        return result
+
+    def _add_column(self, field):
+        code = TYPE_CODES.get(self.types.get(field))
+        if code:
+            column = array(code, bytes(array(code).itemsize * self.count))
+        else:
+            column = [None] * self.count
+        self._columns[field] = column
+        self.masks[field] = bytearray(self.count)
+
+    def _timestamp(self, value):
+        if not isinstance(value, datetime):
+            value = datetime.strptime(value, self.settings.date_format)
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return int(value.timestamp() * 1000)
+
+
+def read_columns(client, endpoint, fields=None, types=None, **kwargs):
+    """Reads a whole resource into :class:`Columns`, one page at a time, so
+    that the full list of documents is never held in memory.
+
+        >>> columns = read_columns(client, 'contacts', ['age', 'born'])
+        >>> ages = columns.to_numpy()['age']
+
+    :param client: The :class:`Client` used to perform the requests.
+    :param endpoint: Target endpoint relative to the base URL of the
+        remote service.
+    :param fields: Optional list of fields to collect. If present, only these
+        fields are requested to the remote service (projection).
+    :param types: Optional dict mapping field names to Eve schema types. If
+        omitted, types are taken from the resource schema in
+        :any:`Settings.domain`, if available.
+    :param \\*\\*kwargs: Optional arguments that :meth:`Client.iter_pages`
+        takes.
+
+    :raises requests.HTTPError: If the remote service returns an error.
+    """
+    settings = client.settings
+    if types is None:
+        schema = settings.domain.get(endpoint, {}).get("schema", {})
+        types = {
+            field: definition["type"]
+            for field, definition in schema.items()
+            if isinstance(definition, dict) and "type" in definition
+        }
+
+    if fields:
+        params = dict(kwargs.pop("params", None) or {})
+        params["projection"] = json.dumps({field: 1 for field in fields})
+        kwargs["params"] = params
+
+    columns = Columns(types, fields, settings)
+    for page in client.iter_pages(endpoint, **kwargs):
+        columns.extend(get_documents(page, settings))
+    return columns
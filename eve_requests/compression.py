@@ -0,0 +1,37 @@
+import gzip
+import zlib
+
+
+def _zstd(data, level):
+    import zstandard  # pylint: disable=import-outside-toplevel
+
+    return zstandard.ZstdCompressor(level=level or 3).compress(data)
+
+
+#: Supported request body encodings, mapped to a ``compress(data, level)``
+#: callable. ``zstd`` requires the zstandard_ package.
+#:
+#: .. _zstandard: https://pypi.org/project/zstandard/
+ENCODINGS = {
+    "gzip": lambda data, level: gzip.compress(data, 1 if level is None else level),
+    "deflate": lambda data, level: zlib.compress(data, 1 if level is None else level),
+    "zstd": _zstd,
+}
+
+
+def compress(data, encoding, level=None):
+    """Returns ``data`` compressed with ``encoding``.
+
+    :param data: The bytes to compress.
+    :param encoding: One of the :data:`ENCODINGS`.
+    :param level: Optional compression level. Defaults to the fastest level
+        for ``gzip`` and ``deflate`` (``1``), and to ``3`` for ``zstd``,
+        which is already fast.
+
+    :raises ValueError: If ``encoding`` is not supported.
+    :raises ImportError: If ``encoding`` is ``zstd`` and zstandard is not
+        installed.
+    """
+    if encoding not in ENCODINGS:
+        raise ValueError("Unsupported encoding '{0}'".format(encoding))
+    return ENCODINGS[encoding](data, level)
@@ -0,0 +1,80 @@
+import time
+
+from requests.exceptions import Timeout
+
+
+class DeadlineExceeded(Timeout):
+    """Raised when an operation can't complete within its :class:`Deadline`.
+    Subclasses :class:`requests.exceptions.Timeout`, so that existing
+    timeout handling applies."""
+
+
+class Deadline:
+    """A time budget for a whole operation, spanning all the requests it
+    involves: pages of a paginated read, batches of a bulk write, retries.
+
+    Pass the same instance to every :class:`Client` call making up the
+    operation. Each request gets the remaining budget as its timeout, and
+    no request is sent once the budget is exhausted::
+
+        >>> deadline = Deadline(2.5)
+        >>> contact = client.get('contacts', unique_id=id, deadline=deadline)
+        >>> client.patch('contacts', contact, deadline=deadline)
+
+    Iterators and batch methods, like :meth:`Client.iter_pages` and
+    :meth:`Client.bulk_post`, also accept a number of seconds, which then
+    applies to the whole iteration.
+
+    Note that Requests timeouts bound each connect and read operation, not
+    the whole transfer, so a slow response body can still overrun the
+    deadline by up to the remaining budget.
+
+    :param seconds: The budget, in seconds.
+    """
+
+    def __init__(self, seconds):
+        #: Time at which the deadline expires, as per :func:`time.monotonic`.
+        self.expires = time.monotonic() + seconds
+
+    @classmethod
+    def of(cls, value):
+        """Returns ``value`` if it is a :class:`Deadline`, a new deadline if
+        it is a number of seconds, ``None`` if it is ``None``."""
+        if value is None or isinstance(value, cls):
+            return value
+        return cls(value)
+
+    @property
+    def remaining(self):
+        """Remaining budget, in seconds."""
+        return max(0.0, self.expires - time.monotonic())
+
+    @property
+    def expired(self):
+        """Wether the budget is exhausted."""
+        return self.remaining <= 0
+
+    def check(self):
+        """Raises :class:`DeadlineExceeded` if the budget is exhausted."""
+        if self.expired:
+            raise DeadlineExceeded("Deadline exceeded")
+
+    def timeout(self, timeout=None):
+        """Returns the timeout to be used for the next request: the remaining
+        budget, or ``timeout`` if it is shorter.
+
+        :param timeout: Optional Requests timeout, either a number or a
+            ``(connect, read)`` tuple.
+
+        :raises DeadlineExceeded: If the budget is exhausted.
+        """
+        self.check()
+        remaining = self.remaining
+        if timeout is None:
+            return remaining
+        if isinstance(timeout, tuple):
+            return tuple(
+                remaining if value is None else min(value, remaining)
+                for value in timeout
+            )
+        return min(timeout, remaining)
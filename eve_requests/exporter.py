@@ -0,0 +1,264 @@
+import argparse
+import bz2
+import gzip
+import hashlib
+import json
+import lzma
+import math
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from .server import Settings
+from .utils import get_documents
+
+#: Supported compression formats, mapped to file opener and file extension.
+COMPRESSORS = {
+    "gzip": (lambda f: gzip.GzipFile(fileobj=f, mode="wb"), ".gz"),
+    "bz2": (lambda f: bz2.BZ2File(f, mode="wb"), ".bz2"),
+    "xz": (lambda f: lzma.LZMAFile(f, mode="wb"), ".xz"),
+}
+
+
+def export(
+    settings,
+    endpoint,
+    directory,
+    processes=None,
+    partitions=None,
+    max_results=100,
+    compress=None,
+    params=None,
+    client_factory=None,
+):
+    """Exports a whole resource to partitioned NDJSON files, fetching and
+    decoding pages in a pool of processes, so that JSON decoding is not
+    bound to a single CPU.
+
+    The resource is split into ranges of pages, one per partition. Each
+    worker process builds its own :class:`Client` and writes its partitions
+    to ``part-NNNNN.ndjson`` files (with a compression suffix, if any). Once
+    all partitions are written, a ``manifest.json`` file with document
+    counts and SHA-256 checksums is added to ``directory``.
+
+        >>> manifest = export(settings, 'contacts', 'out', processes=4, compress='gzip')
+        >>> manifest['count']
+        1000000
+
+    Page ranges are resolved when the export starts, so the resource should
+    not change while it is being exported. Pages are requested in a
+    deterministic order, by :any:`Settings.id_field` unless ``params``
+    holds a ``sort``, so that partitions neither overlap nor miss documents.
+    The manifest tells wether the number of exported documents matches the
+    total reported by the service (``complete``). The remote service must
+    return the total count of documents (``OPTIMIZE_PAGINATION_FOR_SPEED``
+    must be disabled, which is Eve's default).
+
+    The same features are available from the command line::
+
+        $ python -m eve_requests.exporter http://myapi.com contacts out --processes 4
+
+    :param settings: The :class:`Settings` used to configure each client.
+    :param endpoint: Target endpoint relative to the base URL of the
+        remote service.
+    :param directory: Output directory. It is created if missing.
+    :param processes: Number of worker processes. Defaults to the number of
+        CPUs. If ``1``, the export runs in the current process.
+    :param partitions: Number of partitions. Defaults to four per process.
+    :param max_results: Page size. Should not exceed the remote
+        ``PAGINATION_LIMIT`` setting.
+    :param compress: Optional compression format, one of ``gzip``, ``bz2``
+        and ``xz``.
+    :param params: Optional query parameters (like ``where``, ``sort`` or
+        ``projection``) added to every request.
+    :param client_factory: Optional callable returning a new :class:`Client`
+        for the given settings. Must be picklable. Defaults to
+        :class:`Client`.
+    :returns: The manifest, as a dict.
+
+    :raises requests.HTTPError: If the remote service returns an error.
+    :raises ValueError: If the total count of documents is not available,
+        or ``compress`` is not supported.
+    """
+    # pylint: disable=too-many-arguments,too-many-locals
+    if compress and compress not in COMPRESSORS:
+        raise ValueError("Unsupported compression '{0}'".format(compress))
+
+    params = dict(params or {})
+    # skip/limit pagination is only stable with an explicit order
+    params.setdefault("sort", settings.id_field)
+    client = _new_client(settings, client_factory)
+    response = client.get(
+        endpoint, params=dict(params, page=1, max_results=max_results)
+    )
+    response.raise_for_status()
+    total = (response.json().get(settings.meta) or {}).get("total")
+    if total is None:
+        raise ValueError("Total count of documents is not available")
+
+    processes = processes or os.cpu_count() or 1
+    pages = max(1, math.ceil(total / max_results))
+    partitions = min(partitions or processes * 4, pages)
+
+    os.makedirs(directory, exist_ok=True)
+    tasks = []
+    for index in range(partitions):
+        first = index * pages // partitions + 1
+        last = (index + 1) * pages // partitions
+        tasks.append(
+            (
+                settings,
+                endpoint,
+                directory,
+                index,
+                first,
+                last,
+                max_results,
+                compress,
+                params,
+                client_factory,
+            )
+        )
+
+    if processes == 1:
+        results = [_export_partition(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(processes) as executor:
+            results = list(executor.map(_export_partition, tasks))
+
+    count = sum(result["count"] for result in results)
+    manifest = {
+        "endpoint": endpoint,
+        "total": total,
+        "count": count,
+        "complete": count == total,
+        "compress": compress,
+        "partitions": results,
+    }
+    _write_json(os.path.join(directory, "manifest.json"), manifest)
+    return manifest
+
+
+def _export_partition(task):
+    (
+        settings,
+        endpoint,
+        directory,
+        index,
+        first,
+        last,
+        max_results,
+        compress,
+        params,
+        client_factory,
+    ) = task
+    client = _new_client(settings, client_factory)
+
+    filename = "part-{0:05d}.ndjson".format(index)
+    opener = None
+    if compress:
+        opener, extension = COMPRESSORS[compress]
+        filename += extension
+
+    count = 0
+    with open(os.path.join(directory, filename), "wb") as raw:
+        target = _HashingWriter(raw)
+        writer = opener(target) if opener else target
+        for page in range(first, last + 1):
+            response = client.get(
+                endpoint, params=dict(params, page=page, max_results=max_results)
+            )
+            response.raise_for_status()
+            lines = [
+                json.dumps(document, separators=(",", ":"), ensure_ascii=False)
+                for document in get_documents(response.json(), settings)
+            ]
+            if lines:
+                writer.write(("\n".join(lines) + "\n").encode("utf-8"))
+            count += len(lines)
+        if opener:
+            writer.close()
+
+    return {
+        "file": filename,
+        "pages": [first, last],
+        "count": count,
+        "bytes": target.size,
+        "sha256": target.hash.hexdigest(),
+    }
+
+
+class _HashingWriter:
+    """Writes to a binary file while computing size and checksum."""
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.hash = hashlib.sha256()
+        self.size = 0
+
+    def write(self, data):
+        self.hash.update(data)
+        self.size += len(data)
+        return self.raw.write(data)
+
+    def flush(self):
+        self.raw.flush()
+
+
+def _new_client(settings, client_factory):
+    if client_factory:
+        return client_factory(settings)
+    from .client import Client  # pylint: disable=import-outside-toplevel
+
+    return Client(settings)
+
+
+def _write_json(path, data):
+    temp = path + ".tmp"
+    with open(temp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    os.replace(temp, path)
+
+
+def main(argv=None):
+    """Command line entry point. Returns ``1`` if the export is not
+    complete."""
+    parser = argparse.ArgumentParser(
+        description="Export an Eve resource to partitioned NDJSON files."
+    )
+    parser.add_argument("base_url", help="remote service entry point")
+    parser.add_argument("endpoint", help="resource endpoint")
+    parser.add_argument("directory", help="output directory")
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--partitions", type=int, default=None)
+    parser.add_argument("--max-results", type=int, default=100)
+    parser.add_argument("--compress", choices=sorted(COMPRESSORS))
+    parser.add_argument("--where", help="optional JSON filter")
+    args = parser.parse_args(argv)
+
+    manifest = export(
+        Settings(args.base_url),
+        args.endpoint,
+        args.directory,
+        processes=args.processes,
+        partitions=args.partitions,
+        max_results=args.max_results,
+        compress=args.compress,
+        params={"where": args.where} if args.where else None,
+    )
+    print(
+        "{0} documents exported to {1} partitions".format(
+            manifest["count"], len(manifest["partitions"])
+        )
+    )
+    if not manifest["complete"]:
+        print(
+            "warning: {0} documents were expected".format(manifest["total"]),
+            file=sys.stderr,
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,273 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+#: Status codes signaling that the remote service is overloaded.
+OVERLOAD_STATUSES = (429, 503)
+
+
+class TokenBucket:
+    """A thread-safe token bucket, capping the rate of requests.
+
+    :param rate: Number of tokens added per second.
+    :param burst: Maximum number of tokens the bucket can hold. Defaults to
+        ``rate``, with a minimum of one.
+    """
+
+    def __init__(self, rate, burst=None):
+        #: Number of tokens added per second.
+        self.rate = rate
+
+        #: Maximum number of tokens the bucket can hold.
+        self.burst = burst or max(rate, 1)
+
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout=None):
+        """Takes a token from the bucket, waiting for one to be available.
+
+        :param timeout: Optional maximum wait, in seconds.
+        :returns: ``True`` if a token was taken, ``False`` if none would be
+            available within ``timeout``.
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.burst, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+            if timeout is not None:
+                if wait > timeout:
+                    return False
+                timeout -= wait
+            time.sleep(wait)
+
+
+class Governor:
+    """Adapts the number of concurrent requests to what the remote service
+    can sustain, using an additive-increase/multiplicative-decrease (AIMD)
+    algorithm.
+
+    The concurrency limit grows by about one request per round trip as long
+    as responses are fast and successful. It is cut by ``backoff`` whenever
+    the service answers with ``429`` or ``503``, a request fails, or latency
+    exceeds ``tolerance`` times the baseline of the endpoint (the lowest
+    latency of its successful responses observed recently). ``Retry-After``
+    headers pause all requests until the given time; overloaded requests
+    without one are retried after an exponential, jittered backoff (see
+    :meth:`retry_delay`). Optionally, requests can be capped with a token
+    bucket, globally or per endpoint.
+
+        >>> governor = Governor(max_limit=32, rates={'contacts': 50})
+        >>> client = Client(settings, governor=governor)
+        >>> for batch, response in client.bulk_post('contacts', documents):
+        ...     response.raise_for_status()
+
+    A governor can be shared by several :class:`Client` instances.
+
+    :param initial_limit: Initial concurrency limit.
+    :param min_limit: Minimum concurrency limit.
+    :param max_limit: Maximum concurrency limit.
+    :param backoff: Factor applied to the limit on overload.
+    :param tolerance: Latency, as a multiple of the baseline, above which the
+        service is considered overloaded.
+    :param rate: Optional maximum number of requests per second, for every
+        endpoint not listed in ``rates``.
+    :param rates: Optional dict of maximum number of requests per second,
+        keyed by endpoint.
+    :param retries: Number of times a request is retried after a ``429`` or
+        ``503`` response.
+    :param max_retry_after: Maximum pause, in seconds, honored for a
+        ``Retry-After`` header.
+    :param retry_backoff: Delay, in seconds, before the first retry of a
+        ``429`` or ``503`` response without ``Retry-After`` header. It
+        doubles on each further retry, up to ``max_retry_after``.
+    """
+
+    # pylint: disable=too-many-instance-attributes,too-many-arguments
+
+    def __init__(
+        self,
+        initial_limit=4,
+        min_limit=1,
+        max_limit=64,
+        backoff=0.5,
+        tolerance=2.0,
+        rate=None,
+        rates=None,
+        retries=3,
+        max_retry_after=60,
+        retry_backoff=0.1,
+    ):
+        #: Current concurrency limit.
+        self.limit = float(initial_limit)
+
+        #: Minimum concurrency limit.
+        self.min_limit = min_limit
+
+        #: Maximum concurrency limit.
+        self.max_limit = max_limit
+
+        #: Factor applied to the limit on overload.
+        self.backoff = backoff
+
+        #: Latency, as a multiple of the baseline, considered an overload.
+        self.tolerance = tolerance
+
+        #: Number of times a request is retried after a ``429`` or ``503``.
+        self.retries = retries
+
+        #: Maximum pause, in seconds, honored for a ``Retry-After`` header.
+        self.max_retry_after = max_retry_after
+
+        #: Delay, in seconds, before the first retry of an overloaded request
+        #: without ``Retry-After`` header.
+        self.retry_backoff = retry_backoff
+
+        #: Number of requests currently in flight.
+        self.in_flight = 0
+
+        #: Lowest latency of successful responses observed recently, in
+        #: seconds, keyed by endpoint.
+        self.baselines = {}
+
+        self._rate = rate
+        self._rates = rates or {}
+        self._buckets = {}
+        self._paused_until = 0.0
+        self._decreased = 0.0
+        self._condition = threading.Condition()
+
+    def acquire(self, endpoint=None, timeout=None):
+        """Waits until a request to ``endpoint`` can be sent.
+
+        :param endpoint: Optional endpoint, used to pick the rate limit.
+        :param timeout: Optional maximum wait, in seconds.
+        :returns: ``True`` if the request can be sent, ``False`` if it could
+            not be within ``timeout``. In the latter case, :meth:`release`
+            must not be called.
+        """
+        expires = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                if expires is not None and (
+                    now >= expires or self._paused_until >= expires
+                ):
+                    return False
+                wait = expires - now if expires is not None else None
+                if self._paused_until > now:
+                    self._condition.wait(self._paused_until - now)
+                elif self.in_flight >= int(self.limit):
+                    self._condition.wait(wait)
+                else:
+                    break
+            self.in_flight += 1
+
+        bucket = self._bucket(endpoint)
+        if bucket:
+            remaining = None if expires is None else expires - time.monotonic()
+            if not bucket.acquire(remaining):
+                self.cancel(endpoint)
+                return False
+        return True
+
+    def cancel(self, endpoint=None):
+        """Gives back a slot obtained with :meth:`acquire`, for a request
+        which was not sent after all."""
+        # pylint: disable=unused-argument
+        with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    def release(self, endpoint=None, latency=None, status_code=None, retry_after=None):
+        """Records the outcome of a request sent after :meth:`acquire`.
+
+        :param endpoint: The endpoint passed to :meth:`acquire`.
+        :param latency: Request latency, in seconds.
+        :param status_code: Response status code. ``None`` if the request
+            failed without a response.
+        :param retry_after: Optional value of the ``Retry-After`` response
+            header.
+        """
+        with self._condition:
+            self.in_flight -= 1
+
+            baseline = self.baselines.get(endpoint)
+            if status_code is None or status_code in OVERLOAD_STATUSES:
+                self._decrease(latency, baseline)
+            elif latency is not None:
+                # errors are usually answered faster than regular requests
+                if status_code < 400:
+                    if baseline is None or latency < baseline:
+                        baseline = latency
+                    else:
+                        # let the baseline follow slow, lasting latency changes
+                        baseline += (latency - baseline) * 0.01
+                    self.baselines[endpoint] = baseline
+                if baseline is not None and latency > baseline * self.tolerance:
+                    self._decrease(latency, baseline)
+                elif status_code < 500:
+                    self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+            delay = parse_retry_after(retry_after)
+            if delay:
+                delay = min(delay, self.max_retry_after)
+                self._paused_until = max(self._paused_until, time.monotonic() + delay)
+
+            self._condition.notify_all()
+
+    def retry_delay(self, attempt):
+        """Returns the delay, in seconds, before retrying an overloaded
+        request which got no ``Retry-After`` header: ``retry_backoff``
+        doubled ``attempt`` times, capped to ``max_retry_after``, of which
+        the upper half is random so that clients don't retry in lockstep.
+
+        :param attempt: Number of the failed attempt, starting at ``0``.
+        """
+        delay = min(self.max_retry_after, self.retry_backoff * 2**attempt)
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def _decrease(self, latency, baseline=None):
+        # back off at most once per round trip, as concurrent requests are
+        # likely to report the same overload
+        now = time.monotonic()
+        if now - self._decreased < (latency or baseline or 0):
+            return
+        self._decreased = now
+        self.limit = max(self.min_limit, self.limit * self.backoff)
+
+    def _bucket(self, endpoint):
+        rate = self._rates.get(endpoint, self._rate)
+        if not rate:
+            return None
+        key = endpoint if endpoint in self._rates else None
+        with self._condition:
+            if key not in self._buckets:
+                self._buckets[key] = TokenBucket(rate)
+            return self._buckets[key]
+
+
+def parse_retry_after(value):
+    """Returns the number of seconds to wait, as requested by a
+    ``Retry-After`` header (either delay-seconds or an HTTP date). Returns
+    ``None`` if the value is missing or invalid."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    return max(0.0, date.timestamp() - time.time())
@@ -0,0 +1,341 @@
+import csv
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from .utils import purge_document, submit_windowed
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None
+
+
+def read_ndjson(source):
+    """Yields the records of a newline-delimited JSON file, one at a time.
+    Blank lines are skipped.
+
+    :param source: Either a file path or a text file-like object.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, encoding="utf-8") as f:
+            yield from read_ndjson(f)
+        return
+
+    for line in source:
+        if line.strip():
+            yield json.loads(line)
+
+
+def read_csv(source, **kwargs):
+    """Yields the records of a CSV file, one at a time, as dicts keyed by the
+    column names found in the header row. All values are strings.
+
+    :param source: Either a file path or a text file-like object.
+    :param \\*\\*kwargs: Optional arguments that :class:`csv.DictReader`
+        takes.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, encoding="utf-8", newline="") as f:
+            yield from read_csv(f, **kwargs)
+        return
+
+    yield from csv.DictReader(source, **kwargs)
+
+
+class ImportResult:
+    """Statistics about an :class:`Importer` run."""
+
+    def __init__(self):
+        #: Number of records read from the source during this run.
+        self.records = 0
+
+        #: Number of records inserted.
+        self.inserted = 0
+
+        #: Number of records written to the reject file.
+        self.rejected = 0
+
+        #: Number of records skipped because a previous run imported them.
+        self.skipped = 0
+
+        #: Duration of the run, in seconds.
+        self.elapsed = 0.0
+
+        #: Peak resident memory of the process, in bytes (``None`` if not
+        #: available on the platform).
+        self.peak_memory = None
+
+    @property
+    def records_per_second(self):
+        """Number of records processed per second."""
+        return self.records / self.elapsed if self.elapsed else 0.0
+
+    def __repr__(self):
+        return (
+            "<ImportResult records={0} inserted={1} rejected={2} skipped={3} "
+            "{4:.1f} rec/s peak_memory={5}>".format(
+                self.records,
+                self.inserted,
+                self.rejected,
+                self.skipped,
+                self.records_per_second,
+                self.peak_memory,
+            )
+        )
+
+
+class Importer:
+    """Streams records into a resource with concurrent bulk POST requests.
+    Requires bulk inserts to be enabled on the remote service
+    (``BULK_ENABLED``).
+
+    Records are read lazily and only a bounded number of batches is kept in
+    flight, so that memory usage does not depend on the size of the source.
+    Progress is saved to a checkpoint file after every batch; when the
+    importer is run again with the same checkpoint, records which were
+    already processed are skipped. Records rejected by the remote service are
+    written, along with their ``_issues``, to a reject file.
+
+    Batches are checkpointed once their response has been handled, and up to
+    ``max_workers * 2`` batches are in flight at any time. When the import
+    fails with an exception, the batches which did complete are saved before
+    it propagates. When the process is killed outright (say by the OOM
+    killer, or with ``SIGKILL``), batches which were in flight may have been
+    stored without being checkpointed; they are sent again when the import
+    is resumed. A ``unique`` rule in the resource schema has such duplicates
+    rejected.
+
+        >>> importer = Importer(client, 'contacts', checkpoint='contacts.ckpt',
+        ...                     rejects='contacts.rejects')
+        >>> importer.run(read_ndjson('contacts.ndjson'))
+        <ImportResult records=100000 inserted=99998 rejected=2 skipped=0 ...>
+
+    Set :attr:`Client.governor` to adapt concurrency to the remote service.
+
+    :param client: The :class:`Client` used to perform the requests.
+    :param endpoint: Target endpoint relative to the base URL of the
+        remote service.
+    :param batch_size: Number of records per request.
+    :param max_workers: Maximum number of concurrent requests.
+    :param purge: Wether meta fields should be removed from records before
+        they are sent (see :func:`eve_requests.utils.purge_document`).
+    :param transform: Optional callable applied to each record before it is
+        sent.
+    :param checkpoint: Optional path of the checkpoint file.
+    :param rejects: Optional path of the NDJSON reject file. Rejected
+        records are appended to it.
+    :param validator: Optional :class:`eve_requests.validation.Validator`.
+        Records it finds invalid are rejected without being sent.
+    """
+
+    # pylint: disable=too-many-instance-attributes,too-many-arguments
+
+    def __init__(
+        self,
+        client,
+        endpoint,
+        batch_size=50,
+        max_workers=8,
+        purge=False,
+        transform=None,
+        checkpoint=None,
+        rejects=None,
+        validator=None,
+    ):
+        self.client = client
+        self.endpoint = endpoint
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.purge = purge
+        self.transform = transform
+        self.checkpoint = checkpoint
+        self.rejects = rejects
+        self.validator = validator
+
+    def run(self, records):
+        """Imports ``records``, resuming from the checkpoint if there is one.
+
+        :param records: An iterable of records, like :func:`read_ndjson`
+            returns. It must yield the same records, in the same order, every
+            time the import is resumed.
+        :returns: An :class:`ImportResult` instance.
+
+        :raises requests.HTTPError: If the remote service returns an error
+            other than a validation error. Progress made so far is saved to
+            the checkpoint, so the import can be resumed later.
+        """
+        result = ImportResult()
+        start = time.monotonic()
+        done = self._load_checkpoint()
+        pending = deque()
+        reject_file = (
+            open(self.rejects, "a", encoding="utf-8") if self.rejects else None
+        )
+
+        try:
+            with ThreadPoolExecutor(self.max_workers) as executor:
+                items = (
+                    (offset, len(batch)) + self._validate(batch)
+                    for offset, batch in self._batches(records, list(done), result)
+                )
+                try:
+                    for item, future in submit_windowed(
+                        executor, self._post, items, self.max_workers * 2, pending
+                    ):
+                        self._complete(item, future, done, result, reject_file)
+                finally:
+                    if pending:
+                        self._interrupt(pending, done, result, reject_file)
+        finally:
+            if reject_file:
+                reject_file.close()
+            result.elapsed = time.monotonic() - start
+            result.peak_memory = _peak_memory()
+
+        return result
+
+    def _batches(self, records, done, result):
+        batch = []
+        offset = 0
+        for index, record in enumerate(records):
+            result.records += 1
+            if _is_done(done, index):
+                result.skipped += 1
+                continue
+            if not batch:
+                offset = index
+            elif index != offset + len(batch):
+                # batches are contiguous ranges of records
+                yield offset, batch
+                batch = []
+                offset = index
+            if self.purge:
+                record = purge_document(record, self.client.settings)
+            if self.transform:
+                record = self.transform(record)
+            batch.append(record)
+            if len(batch) == self.batch_size:
+                yield offset, batch
+                batch = []
+        if batch:
+            yield offset, batch
+
+    def _validate(self, batch):
+        if not self.validator:
+            return batch, ()
+        valid, invalid = [], []
+        for record in batch:
+            issues = self.validator.validate(record)
+            if issues:
+                invalid.append((record, issues))
+            else:
+                valid.append(record)
+        return valid, invalid
+
+    def _post(self, item):
+        batch = item[2]
+        return self.client.post(self.endpoint, batch) if batch else None
+
+    def _complete(self, item, future, done, result, reject_file):
+        offset, count, batch, invalid = item
+        response = future.result()
+        if response is not None:
+            if response.status_code == 422:
+                self._handle_rejects(batch, response, result, reject_file)
+            else:
+                response.raise_for_status()
+                result.inserted += len(batch)
+        for record, issues in invalid:
+            self._reject(record, issues, result, reject_file)
+
+        done.append([offset, offset + count])
+        done[:] = _merge(done)
+        self._save_checkpoint(done)
+
+    def _interrupt(self, pending, done, result, reject_file):
+        # save the batches which did complete, so that they are skipped when
+        # the import is resumed
+        for _, future in pending:
+            future.cancel()
+        wait([future for _, future in pending])
+        for item, future in pending:
+            if future.cancelled():
+                continue
+            try:
+                self._complete(item, future, done, result, reject_file)
+            except Exception:  # pylint: disable=broad-except
+                # the original error is more relevant
+                continue
+
+    def _handle_rejects(self, batch, response, result, reject_file):
+        settings = self.client.settings
+        items = response.json().get(settings.items)
+        if not isinstance(items, list) or len(items) != len(batch):
+            items = [response.json()] * len(batch)
+
+        # Eve rejects the whole batch; valid records are sent again
+        valid = []
+        for record, item in zip(batch, items):
+            if item.get(settings.issues):
+                self._reject(record, item[settings.issues], result, reject_file)
+            else:
+                valid.append(record)
+
+        if valid:
+            retry = self.client.post(self.endpoint, valid)
+            retry.raise_for_status()
+            result.inserted += len(valid)
+
+    def _reject(self, record, issues, result, reject_file):
+        result.rejected += 1
+        if reject_file:
+            reject_file.write(
+                json.dumps(
+                    {"record": record, self.client.settings.issues: issues},
+                    default=str,
+                )
+                + "\n"
+            )
+
+    def _load_checkpoint(self):
+        if not self.checkpoint or not os.path.exists(self.checkpoint):
+            return []
+        with open(self.checkpoint, encoding="utf-8") as f:
+            return json.load(f)["done"]
+
+    def _save_checkpoint(self, done):
+        if not self.checkpoint:
+            return
+        temp = self.checkpoint + ".tmp"
+        with open(temp, "w", encoding="utf-8") as f:
+            json.dump({"done": done}, f)
+        os.replace(temp, self.checkpoint)
+
+
+def _merge(ranges):
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def _is_done(done, index):
+    for start, end in done:
+        if start <= index < end:
+            return True
+    return False
+
+
+def _peak_memory():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
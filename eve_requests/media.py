@@ -0,0 +1,174 @@
+import io
+import json
+import mimetypes
+import os
+import uuid
+
+
+class MultipartEncoder:
+    """A read-only, file-like ``multipart/form-data`` body which streams its
+    file parts straight from their sources, so that memory usage stays
+    constant regardless of file sizes. Suitable for Eve_ media fields.
+
+    File parts can be any object with a ``read`` method, like open files,
+    :obj:`mmap.mmap` instances or :class:`io.BytesIO` buffers. Since the
+    length of the body is known in advance, requests are sent with a
+    ``Content-Length`` header, not chunked.
+
+        >>> with open('avatar.png', 'rb') as f:
+        ...     body = MultipartEncoder({'name': 'john'}, {'avatar': f})
+        ...     requests.post(url, data=body, headers={'Content-Type': body.content_type})
+
+    .. _Eve:
+       http://python-eve.org/
+
+    :param fields: Dict of form fields. Non-string values are JSON encoded.
+    :param files: Dict of file fields. Values are either file-like objects
+        or ``(filename, fileobj)`` or ``(filename, fileobj, content_type)``
+        tuples.
+    :param callback: Optional callable invoked as ``callback(bytes_read,
+        total_bytes)`` every time a chunk of the body is read.
+    :param as_json: Wether all form field values should be JSON encoded,
+        strings included. See :any:`Settings.multipart_form_fields_as_json`.
+    :param boundary: Optional multipart boundary.
+    """
+
+    def __init__(
+        self, fields=None, files=None, callback=None, as_json=False, boundary=None
+    ):
+        #: The multipart boundary.
+        self.boundary = boundary or uuid.uuid4().hex
+
+        #: Optional progress callback.
+        self.callback = callback
+
+        #: Number of bytes read so far.
+        self.bytes_read = 0
+
+        self._parts = []
+        self._length = 0
+        self._current = 0
+
+        for name, value in (fields or {}).items():
+            if as_json or not isinstance(value, str):
+                value = json.dumps(value)
+            header = self._part_header(name)
+            self._add_bytes(header + value.encode("utf-8") + b"\r\n")
+
+        for name, value in (files or {}).items():
+            filename, fileobj, content_type = self._unpack_file(name, value)
+            self._add_bytes(self._part_header(name, filename, content_type))
+            self._parts.append(fileobj)
+            self._length += _remaining_length(fileobj)
+            self._add_bytes(b"\r\n")
+
+        self._add_bytes(b"--" + self.boundary.encode("ascii") + b"--\r\n")
+
+    @property
+    def content_type(self):
+        """Value of the ``Content-Type`` header to be sent along the body."""
+        return "multipart/form-data; boundary=" + self.boundary
+
+    def __len__(self):
+        return self._length
+
+    def read(self, size=-1):
+        """Reads up to ``size`` bytes of the body. If ``size`` is negative,
+        the remainder of the body is returned in one go, which defeats
+        streaming and should be avoided on large bodies."""
+        if size is None or size < 0:
+            size = self._length - self.bytes_read
+
+        chunks = []
+        remaining = size
+        while remaining > 0 and self._current < len(self._parts):
+            chunk = self._parts[self._current].read(remaining)
+            if not chunk:
+                self._current += 1
+                continue
+            chunks.append(chunk)
+            remaining -= len(chunk)
+
+        data = b"".join(chunks)
+        self.bytes_read += len(data)
+        if self.callback and data:
+            self.callback(self.bytes_read, self._length)
+        return data
+
+    def _part_header(self, name, filename=None, content_type=None):
+        disposition = 'form-data; name="%s"' % name
+        if filename is not None:
+            disposition += '; filename="%s"' % filename
+        lines = [
+            "--" + self.boundary,
+            "Content-Disposition: " + disposition,
+        ]
+        if content_type:
+            lines.append("Content-Type: " + content_type)
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("utf-8")
+
+    def _add_bytes(self, data):
+        self._parts.append(io.BytesIO(data))
+        self._length += len(data)
+
+    @staticmethod
+    def _unpack_file(name, value):
+        content_type = None
+        if isinstance(value, (tuple, list)):
+            filename, fileobj = value[0], value[1]
+            if len(value) > 2:
+                content_type = value[2]
+        else:
+            fileobj = value
+            filename = os.path.basename(getattr(value, "name", None) or name)
+        if not content_type:
+            content_type = (
+                mimetypes.guess_type(filename)[0] or "application/octet-stream"
+            )
+        return filename, fileobj, content_type
+
+
+def _remaining_length(fileobj):
+    if hasattr(fileobj, "fileno"):
+        try:
+            return os.fstat(fileobj.fileno()).st_size - fileobj.tell()
+        except (OSError, io.UnsupportedOperation):
+            pass
+    if hasattr(fileobj, "__len__"):
+        # mmap.mmap
+        return len(fileobj) - fileobj.tell()
+    position = fileobj.tell()
+    end = fileobj.seek(0, os.SEEK_END)
+    fileobj.seek(position)
+    return end - position
+
+
+def stream_to(response, destination, chunk_size=64 * 1024, callback=None):
+    """Writes the body of a streamed :class:`requests.Response` to
+    ``destination`` one chunk at a time.
+
+    :param response: A response obtained with ``stream=True``.
+    :param destination: Either a file path or a writable file-like object.
+    :param chunk_size: Size of the chunks read from the network.
+    :param callback: Optional callable invoked as ``callback(bytes_written,
+        total_bytes)`` after every chunk. ``total_bytes`` is ``None`` when
+        the response has no ``Content-Length`` header.
+    :returns: The number of bytes written.
+    """
+    total = response.headers.get("Content-Length")
+    total = int(total) if total is not None else None
+
+    if isinstance(destination, (str, os.PathLike)):
+        with open(destination, "wb") as f:
+            return stream_to(response, f, chunk_size, callback)
+
+    written = 0
+    try:
+        for chunk in response.iter_content(chunk_size=chunk_size):
+            destination.write(chunk)
+            written += len(chunk)
+            if callback:
+                callback(written, total)
+    finally:
+        response.close()
+    return written
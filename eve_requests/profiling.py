@@ -0,0 +1,245 @@
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+#: Metrics which can be written to a collapsed stacks file.
+METRICS = ("wall", "cpu", "alloc")
+
+
+class Profiler:
+    """Collects wall time, CPU time and, optionally, memory allocation
+    statistics for each stage of the requests sent by a :class:`Client`,
+    per endpoint::
+
+        >>> client.profiler = Profiler(window=60)
+        >>> ...
+        >>> print(client.profiler.report())
+        endpoint  stage                     calls   wall ms    cpu ms  alloc KiB
+        contacts  build                      1000     41.20     40.87      512.3
+        contacts  build;purge                1000      8.02      7.95        0.0
+        contacts  build;resolve_url          1000      4.11      4.09        0.0
+        ...
+        contacts  client 98.44ms wall, send 5120.37ms wall (88.10ms cpu)
+
+    The stages are ``build`` (building the request, which includes
+    ``purge``, ``diff``, ``resolve_url`` and ``resolve_etag``), ``prepare``
+    (preparing and encoding it), ``send`` (sending it and reading the
+    response headers) and ``decode`` (JSON decoding, when
+    :meth:`requests.Response.json` is called). Nested stages are reported
+    with their path, like ``build;purge``; times include nested stages.
+
+    CPU time is measured per thread. Allocations are traced with
+    :mod:`tracemalloc`, which slows the program down noticeably; they are
+    the net growth of traced memory during a stage, and are only accurate
+    when no other thread allocates memory meanwhile.
+
+    :param window: Optional duration, in seconds, of the profiling window.
+        It starts with the first profiled stage; stages starting after it
+        ends are not profiled. See :meth:`reset`.
+    :param allocations: Wether memory allocations should be traced.
+    """
+
+    def __init__(self, window=None, allocations=False):
+        #: Duration of the profiling window, in seconds. ``None`` if
+        #: unbounded.
+        self.window = window
+
+        #: Wether memory allocations are traced.
+        self.allocations = allocations
+
+        #: Collected statistics, keyed by ``(endpoint, path)`` where ``path``
+        #: is a tuple of stage names. Values are lists of call count, wall
+        #: time, CPU time and allocated bytes, followed by the same times
+        #: and bytes excluding nested stages.
+        self.stats = {}
+
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._started = None
+        self._tracing = False
+
+    @property
+    def active(self):
+        """Wether stages are currently profiled."""
+        return (
+            self.window is None
+            or self._started is None
+            or time.monotonic() < self._started + self.window
+        )
+
+    def reset(self):
+        """Clears the statistics and starts a new profiling window."""
+        with self._lock:
+            self.stats = {}
+            self._started = None
+
+    def stop(self):
+        """Stops tracing allocations, if the profiler started it."""
+        with self._lock:
+            if self._tracing:
+                tracemalloc.stop()
+                self._tracing = False
+
+    @contextmanager
+    def stage(self, name, endpoint=None):
+        """Profiles the enclosed block as the ``name`` stage of a request to
+        ``endpoint``. If ``endpoint`` is omitted, it is inherited from the
+        enclosing stage."""
+        if not self.active:
+            self.stop()
+            yield
+            return
+        if self._started is None:
+            self._start()
+
+        stack = self._stack()
+        if endpoint is None:
+            endpoint = stack[-1][1] if stack else ""
+        path = (stack[-1][2] if stack else ()) + (name,)
+        # child wall, cpu and alloc are added up in the frame
+        frame = [name, endpoint, path, 0.0, 0.0, 0]
+        stack.append(frame)
+        alloc = self._traced()
+        cpu = time.thread_time()
+        wall = time.perf_counter()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall
+            cpu = time.thread_time() - cpu
+            alloc = self._traced() - alloc
+            stack.pop()
+            if stack:
+                parent = stack[-1]
+                parent[3] += wall
+                parent[4] += cpu
+                parent[5] += alloc
+            self._add(
+                (endpoint, path),
+                wall,
+                cpu,
+                alloc,
+                wall - frame[3],
+                cpu - frame[4],
+                alloc - frame[5],
+            )
+
+    def wrap(self, name, endpoint, function):
+        """Returns a function calling ``function`` in the ``name`` stage of
+        requests to ``endpoint``."""
+
+        def wrapper(*args, **kwargs):
+            with self.stage(name, endpoint):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    def report(self):
+        """Returns a human readable table of the collected statistics,
+        followed by a summary per endpoint telling client-side overhead apart
+        from the time spent sending requests and waiting for responses."""
+        with self._lock:
+            items = sorted(self.stats.items())
+
+        width = max([len("endpoint")] + [len(key[0]) for key, _ in items])
+        row = "{0:<{width}}  {1:<24} {2:>7} {3:>9.2f} {4:>9.2f} {5:>10.1f}"
+        lines = [
+            "{0:<{width}}  {1:<24} {2:>7} {3:>9} {4:>9} {5:>10}".format(
+                "endpoint",
+                "stage",
+                "calls",
+                "wall ms",
+                "cpu ms",
+                "alloc KiB",
+                width=width,
+            )
+        ]
+        summary = {}
+        for (endpoint, path), values in items:
+            count, wall, cpu, alloc = values[:4]
+            lines.append(
+                row.format(
+                    endpoint,
+                    ";".join(path),
+                    count,
+                    wall * 1000,
+                    cpu * 1000,
+                    alloc / 1024,
+                    width=width,
+                )
+            )
+            if len(path) == 1:
+                totals = summary.setdefault(endpoint, [0.0, 0.0, 0.0])
+                if path[0] == "send":
+                    totals[1] += wall
+                    totals[2] += cpu
+                else:
+                    totals[0] += wall
+
+        for endpoint, (client, send, send_cpu) in sorted(summary.items()):
+            lines.append(
+                "{0:<{width}}  client {1:.2f}ms wall, send {2:.2f}ms wall "
+                "({3:.2f}ms cpu)".format(
+                    endpoint, client * 1000, send * 1000, send_cpu * 1000, width=width
+                )
+            )
+        return "\n".join(lines)
+
+    def write_collapsed(self, path, metric="wall"):
+        """Writes the collected statistics to ``path`` in the collapsed stacks
+        format read by flamegraph tools (like ``flamegraph.pl`` or
+        speedscope): one ``endpoint;stage;...`` line per stage, followed by
+        its own value, excluding nested stages.
+
+        :param path: Path of the output file.
+        :param metric: One of the :data:`METRICS`. Times are written in
+            microseconds, allocations in bytes.
+
+        :raises ValueError: If ``metric`` is not supported.
+        """
+        if metric not in METRICS:
+            raise ValueError("Unsupported metric '{0}'".format(metric))
+        index = 4 + METRICS.index(metric)
+        scale = 1 if metric == "alloc" else 10 ** 6
+
+        with self._lock:
+            items = sorted(self.stats.items())
+        with open(path, "w", encoding="utf-8") as f:
+            for (endpoint, stages), values in items:
+                value = int(round(values[index] * scale))
+                if value > 0:
+                    f.write(
+                        "{0};{1} {2}\n".format(endpoint or "-", ";".join(stages), value)
+                    )
+
+    def _start(self):
+        with self._lock:
+            if self._started is not None:
+                return
+            if self.allocations and not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._tracing = True
+            self._started = time.monotonic()
+
+    def _stack(self):
+        try:
+            return self._local.stack
+        except AttributeError:
+            self._local.stack = []
+            return self._local.stack
+
+    def _traced(self):
+        if not self.allocations or not tracemalloc.is_tracing():
+            return 0
+        return tracemalloc.get_traced_memory()[0]
+
+    def _add(self, key, *values):
+        with self._lock:
+            stats = self.stats.get(key)
+            if stats is None:
+                self.stats[key] = [1] + list(values)
+            else:
+                stats[0] += 1
+                for index, value in enumerate(values, 1):
+                    stats[index] += value
@@ -0,0 +1,215 @@
+import keyword
+from collections.abc import MutableMapping
+
+from .server import Settings
+
+
+class Record(MutableMapping):
+    """Base class for compact, schema-derived documents. Do not instantiate
+    directly; use :func:`record_class` to create a subclass for a resource.
+
+    Known fields are stored in ``__slots__``, so that a record takes a
+    fraction of the memory of the equivalent dict. Fields which are not part
+    of the schema are kept in a regular dict, so that conversion back to a
+    dict is always lossless. Records behave like mutable mappings, thus they
+    can be passed to :class:`Client` write methods as they are.
+    """
+
+    __slots__ = ("_extra",)
+
+    #: Field names, in schema order.
+    _fields = ()
+
+    #: Maps field names to slot names.
+    _index = {}
+
+    def __init__(self, *args, **kwargs):
+        self._extra = None
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    @classmethod
+    def from_dict(cls, document):
+        """Returns a new record holding the contents of ``document``."""
+        record = cls.__new__(cls)
+        index = cls._index
+        extra = None
+        for key, value in document.items():
+            slot = index.get(key)
+            if slot is None:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+            else:
+                setattr(record, slot, value)
+        record._extra = extra
+        return record
+
+    def to_dict(self):
+        """Returns the record as a plain dict."""
+        return dict(self.items())
+
+    def __getitem__(self, key):
+        slot = self._index.get(key)
+        if slot is None:
+            if self._extra is None:
+                raise KeyError(key)
+            return self._extra[key]
+        try:
+            return getattr(self, slot)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __setitem__(self, key, value):
+        slot = self._index.get(key)
+        if slot is None:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+        else:
+            setattr(self, slot, value)
+
+    def __delitem__(self, key):
+        slot = self._index.get(key)
+        if slot is None:
+            if self._extra is None:
+                raise KeyError(key)
+            del self._extra[key]
+        else:
+            try:
+                delattr(self, slot)
+            except AttributeError:
+                raise KeyError(key) from None
+
+    def __iter__(self):
+        for field, slot in self._index.items():
+            if hasattr(self, slot):
+                yield field
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return "{0}({1!r})".format(type(self).__name__, self.to_dict())
+
+
+def record_class(schema, name="Record", settings=None):
+    """Returns a new :class:`Record` subclass for documents matching
+    ``schema``. Meta fields (see :any:`Settings.meta_fields`) are included
+    automatically.
+
+        >>> Contact = record_class(settings.domain['contacts']['schema'], 'Contact')
+        >>> contacts = get_documents(r.json(), settings, record_class=Contact)
+        >>> contacts[0]['lastname']
+        'Green'
+        >>> contacts[0].lastname
+        'Green'
+
+    Fields are also available as attributes, provided that their name is a
+    valid identifier which does not clash with the mapping interface.
+
+    :param schema: The resource schema, either a dict as found in the Eve
+        ``DOMAIN`` setting, or an iterable of field names.
+    :param name: Name of the new class.
+    :param settings: Optional :any:`Settings` instance to be used while
+        building the class.
+    """
+    if not settings:
+        settings = Settings()
+
+    fields = list(settings.meta_fields)
+    fields += [field for field in schema if field not in fields]
+
+    index = {}
+    reserved = set(dir(Record))
+    for position, field in enumerate(fields):
+        if (
+            isinstance(field, str)
+            and field.isidentifier()
+            and not keyword.iskeyword(field)
+            and not field.startswith("__")
+            and field not in reserved
+        ):
+            index[field] = field
+        else:
+            slot = "_f{0}".format(position)
+            while slot in fields:
+                slot = "_" + slot
+            index[field] = slot
+
+    return type(
+        name,
+        (Record,),
+        {
+            "__slots__": tuple(index.values()),
+            "_fields": tuple(fields),
+            "_index": index,
+        },
+    )
+
+
+def records_hook(record_class, settings=None):
+    """Returns an ``object_pairs_hook`` for :func:`json.loads` (or
+    :meth:`requests.Response.json`) which decodes documents straight into
+    ``record_class`` instances. Unlike converting decoded dicts, no dict is
+    built for the documents, which keeps peak memory down on large pages::
+
+        >>> page = r.json(object_pairs_hook=records_hook(Contact, settings))
+        >>> get_documents(page, settings)
+        [Contact({'_id': '5b89b1b091a5d0000495f54e', 'lastname': 'Green', ...})]
+
+    Objects holding the id field (see :any:`Settings.id_field`) are decoded
+    as records, unless they are nested within another object, like embedded
+    documents, which are returned as dicts.
+
+    :param record_class: The :class:`Record` subclass used to hold the
+        documents.
+    :param settings: Optional :any:`Settings` instance.
+    """
+    if not settings:
+        settings = Settings()
+
+    index = record_class._index  # pylint: disable=protected-access
+    id_slot = index.get(settings.id_field)
+    items = settings.items
+    new = record_class.__new__
+
+    def hook(pairs):
+        record = new(record_class)
+        extra = None
+        document = False
+        for key, value in pairs:
+            kind = type(value)
+            if kind is record_class or (
+                kind is list
+                and value
+                and type(value[0]) is record_class
+                and key != items
+            ):
+                # embedded documents
+                return hook([(key, _plain(value)) for key, value in pairs])
+            slot = index.get(key)
+            if slot is None:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+            else:
+                if slot is id_slot:
+                    document = True
+                setattr(record, slot, value)
+        if not document:
+            return dict(pairs)
+        record._extra = extra  # pylint: disable=protected-access
+        return record
+
+    return hook
+
+
+def _plain(value):
+    if isinstance(value, Record):
+        return value.to_dict()
+    if isinstance(value, list):
+        return [item.to_dict() if isinstance(item, Record) else item for item in value]
+    return value
@@ -0,0 +1,165 @@
+import json
+from collections import OrderedDict
+
+from .utils import get_documents
+
+
+class ReferenceResolver:
+    """Resolves Eve_ ``data_relation`` fields for a batch of documents,
+    without issuing one request per reference.
+
+    Foreign ids are collected from all documents first, then fetched in bulk
+    with ``where={"_id": {"$in": [...]}}`` queries. Fetched documents are kept
+    in a bounded, least-recently-used cache, so that references shared by
+    different batches are only retrieved once.
+
+    Basic Usage::
+
+        >>> from eve_requests import Client, ReferenceResolver
+        >>> client = Client(settings)
+        >>> resolver = ReferenceResolver(client)
+        >>> invoices = get_documents(client.get('invoices').json())
+        >>> resolver.resolve(invoices, 'contact', 'contacts')
+        >>> invoices[0]['contact']
+        {'_id': '5b89b1b091a5d0000495f54e', 'lastname': 'Green', ...}
+
+    When the remote service allows embedding for the relation, the referenced
+    documents can be retrieved along with the documents themselves::
+
+        >>> invoices = resolver.get_embedded('invoices', 'contact')
+
+    .. _Eve:
+       http://python-eve.org/
+
+    :param client: The :class:`Client` used to perform the requests.
+    :param cache_size: Maximum number of referenced documents kept in cache.
+    :param batch_size: Maximum number of ids requested with a single query.
+        Should not exceed the remote ``PAGINATION_LIMIT`` setting.
+    """
+
+    def __init__(self, client, cache_size=1000, batch_size=50):
+        #: The :class:`Client` used to perform the requests.
+        self.client = client
+
+        #: Maximum number of referenced documents kept in cache.
+        self.cache_size = cache_size
+
+        #: Maximum number of ids requested with a single query.
+        self.batch_size = batch_size
+
+        self._cache = OrderedDict()
+
+    def resolve(self, documents, field, endpoint, **kwargs):
+        """Replaces the references stored in ``field`` with the referenced
+        documents. Both single references and lists of references are
+        supported. References which can't be found on the remote service are
+        left untouched.
+
+        :param documents: The documents holding the references. They are
+            updated in place.
+        :param field: Name of the field holding the reference.
+        :param endpoint: Endpoint of the referenced resource, relative to the
+            base URL of the remote service.
+        :param \\*\\*kwargs: Optional arguments that :obj:`requests.Request`
+            takes.
+        :returns: The updated ``documents``.
+
+        :raises requests.HTTPError: If the remote service returns an error.
+        """
+        ids = OrderedDict()
+        for document in documents:
+            for unique_id in self._references(document.get(field)):
+                ids[unique_id] = None
+
+        referenced = self.fetch(endpoint, list(ids), **kwargs)
+
+        for document in documents:
+            value = document.get(field)
+            if isinstance(value, list):
+                document[field] = [
+                    referenced.get(item, item) if self._is_id(item) else item
+                    for item in value
+                ]
+            elif self._is_id(value):
+                document[field] = referenced.get(value, value)
+
+        return documents
+
+    def fetch(self, endpoint, ids, **kwargs):
+        """Returns the documents matching ``ids``, as a dict keyed by id.
+        Cached documents are not requested again.
+
+        :param endpoint: Endpoint of the referenced resource, relative to the
+            base URL of the remote service.
+        :param ids: The ids of the documents to retrieve.
+        :param \\*\\*kwargs: Optional arguments that :obj:`requests.Request`
+            takes.
+
+        :raises requests.HTTPError: If the remote service returns an error.
+        """
+        found = {}
+        missing = []
+        for unique_id in ids:
+            key = (endpoint, unique_id)
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                found[unique_id] = self._cache[key]
+            else:
+                missing.append(unique_id)
+
+        id_field = self.client.settings.id_field
+        params = dict(kwargs.pop("params", None) or {})
+        for start in range(0, len(missing), self.batch_size):
+            batch = missing[start : start + self.batch_size]
+            query = dict(params)
+            query["where"] = json.dumps({id_field: {"$in": batch}})
+            query["max_results"] = len(batch)
+            response = self.client.get(endpoint, params=query, **kwargs)
+            response.raise_for_status()
+
+            for document in get_documents(response.json(), self.client.settings):
+                found[document[id_field]] = document
+                self._store((endpoint, document[id_field]), document)
+
+        return found
+
+    def get_embedded(self, endpoint, *fields, **kwargs):
+        """Retrieves the documents at ``endpoint``, asking the remote service
+        to embed the referenced documents. Embedding must be allowed for each
+        of ``fields`` on the remote service.
+
+        :param endpoint: Target endpoint relative to the base URL of the
+            remote service.
+        :param fields: The fields to be embedded.
+        :param \\*\\*kwargs: Optional arguments that :obj:`requests.Request`
+            takes.
+        :returns: The list of retrieved documents.
+
+        :raises requests.HTTPError: If the remote service returns an error.
+        """
+        params = dict(kwargs.pop("params", None) or {})
+        params["embedded"] = json.dumps({field: 1 for field in fields})
+        response = self.client.get(endpoint, params=params, **kwargs)
+        response.raise_for_status()
+        return get_documents(response.json(), self.client.settings)
+
+    def clear(self):
+        """Empties the cache."""
+        self._cache.clear()
+
+    def _store(self, key, document):
+        self._cache[key] = document
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    @classmethod
+    def _references(cls, value):
+        if isinstance(value, list):
+            return [item for item in value if cls._is_id(item)]
+        return [value] if cls._is_id(value) else []
+
+    @staticmethod
+    def _is_id(value):
+        # embedded (already resolved) references are dicts
+        return value is not None and not isinstance(value, (dict, list))
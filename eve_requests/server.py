@@ -18,7 +18,7 @@ class Settings:
         >>> client = Client(settings)
     
     Alternatively, and assuming you have it available, you can initialize directly 
-    from the Eve settings file (not implemented yet):
+    from the Eve settings file:
 
         >>> from eve_requests Client, Settings
         >>> settings = Settings.from_file("settings.py")
@@ -79,6 +79,30 @@ class Settings:
         #: setting`. Defaults to ``_links``.
         self.links = "_links"
 
+        #: Allows to customize the meta field. Should match the remote ``META``
+        #: setting. Defaults to ``_meta``.
+        self.meta = "_meta"
+
+        #: Wether nested documents are merged on PATCH requests. Should match
+        #: the remote ``MERGE_NESTED_DOCUMENTS`` setting. Defaults to
+        #: ``True``.
+        self.merge_nested_documents = True
+
+        #: Wether multipart form field values are JSON decoded by the service.
+        #: Should match the remote ``MULTIPART_FORM_FIELDS_AS_JSON`` setting.
+        #: Defaults to ``False``.
+        self.multipart_form_fields_as_json = False
+
+        #: Resource definitions, keyed by resource name. Should match the
+        #: remote ``DOMAIN`` setting; only the ``schema`` of each resource is
+        #: used. Defaults to an empty dict.
+        self.domain = {}
+
+        #: Format of the datetime values returned by the service. Should match
+        #: the remote ``DATE_FORMAT`` setting. Defaults to
+        #: ``"%a, %d %b %Y %H:%M:%S GMT"``.
+        self.date_format = "%a, %d %b %Y %H:%M:%S GMT"
+
     @property
     def meta_fields(self):
         """List of remote meta fields handled automatically by the service. """
@@ -95,11 +119,54 @@ class Settings:
         raise NotImplementedError()
 
     @staticmethod
-    def from_file(url):
+    def from_file(path, base_url=None):
         """ Loads configuration from standard Eve settings file and returns
-        it as a new :class:`Settings` instance. 
-        
-        Note: 
-            not implemented
+        it as a new :class:`Settings` instance. The ``DOMAIN`` setting is
+        loaded too, so that payloads can be validated on the client side
+        (see :mod:`eve_requests.validation`).
+
+        Note that the settings file is executed, like Eve itself does.
+
+        :param path: Path of the Eve settings file.
+        :param base_url: Optional remote service entry point. If omitted, it
+            is inferred from the ``SERVER_NAME``, ``URL_PREFIX`` and
+            ``API_VERSION`` settings.
         """
-        raise NotImplementedError()
+        import runpy  # pylint: disable=import-outside-toplevel
+
+        values = runpy.run_path(path)
+
+        if base_url is None:
+            base_url = "http://" + values.get("SERVER_NAME", "localhost:5000")
+            prefix = "/".join(
+                value.strip("/")
+                for value in (values.get("URL_PREFIX"), values.get("API_VERSION"))
+                if value
+            )
+            if prefix:
+                base_url += "/" + prefix + "/"
+
+        settings = Settings(base_url)
+        for name, attribute in _EVE_SETTINGS.items():
+            if name in values:
+                setattr(settings, attribute, values[name])
+        return settings
+
+
+#: Eve settings mapped to :class:`Settings` attributes.
+_EVE_SETTINGS = {
+    "IF_MATCH": "if_match",
+    "ETAG": "etag",
+    "DATE_CREATED": "created",
+    "LAST_UPDATED": "updated",
+    "ID_FIELD": "id_field",
+    "STATUS": "status",
+    "ISSUES": "issues",
+    "ITEMS": "items",
+    "LINKS": "links",
+    "META": "meta",
+    "MERGE_NESTED_DOCUMENTS": "merge_nested_documents",
+    "MULTIPART_FORM_FIELDS_AS_JSON": "multipart_form_fields_as_json",
+    "DOMAIN": "domain",
+    "DATE_FORMAT": "date_format",
+}
@@ -1,19 +1,156 @@
+import json
+import os
+import threading
+from urllib.parse import urljoin
+
 import requests
 
+from .server import Settings
+
 
 class Session(requests.Session):
-    def __init__(self):
-        self.endpoints = []
-        self.base_url = None
-        self.etag = "_etag"
-        self.if_match = True
+    """A :class:`requests.Session` which knows the endpoints of a remote Eve_
+    service, so that resources can be addressed by their short name, even
+    when their ``url`` setting differs from it::
+
+        >>> session = Session(Settings('https://myapi.com/'))
+        >>> session.get('people')
+        <Response [200]>
+        >>> session.patch('people/5b89b1b0', json={'name': 'jane'})
+        <Response [200]>
+
+    Routes are discovered once, on first use, from the links of the home
+    endpoint (which requires ``HATEOAS`` to be enabled on the service), and
+    from :any:`Settings.domain` when it is set. They are kept as a map of
+    absolute URLs, so that resolving a name on each request is a single
+    lookup. Names which are not routed, and absolute URLs, are sent as they
+    are, relative to :any:`Settings.base_url`.
+
+    The home endpoint is requested with the ``auth`` and ``headers`` of the
+    request which triggers discovery. If it can't be read, only the routes
+    found in :any:`Settings.domain` are used, until :meth:`discover` is
+    called again. Routes can also be preloaded by setting :attr:`routes`.
+
+    .. _Eve:
+       http://python-eve.org/
+
+    :param settings: Optional :class:`Settings` instance.
+    :param routes_file: Optional path of a JSON file where discovered routes
+        are persisted, so that they are not discovered again by later
+        sessions. The file is ignored if it was written for another base URL.
+    """
+
+    def __init__(self, settings=None, routes_file=None):
         super().__init__()
 
-    def post(self, url_or_endpoint, json=None, **kwargs):
-        if url_or_endpoint in self.endpoints:
-            endpoint = self.endpoints[url_or_endpoint]
-        else:
-            endpoint = url_or_endpoint
-        url = urljoin(self.config.base_url, endpoint)
+        #: Remote service settings. Defaults to a new instance of
+        #: :class:`Settings`.
+        self.settings = settings or Settings()
+
+        #: Optional path of the file where routes are persisted.
+        self.routes_file = routes_file
+
+        #: Absolute URLs of the remote resources, keyed by resource name,
+        #: title and url. ``None`` until routes are discovered; can be set to
+        #: skip discovery.
+        self.routes = None
+
+        self._routes_lock = threading.Lock()
+
+    def request(self, method, url, *args, **kwargs):
+        # pylint: disable=arguments-differ
+        if self.routes is None:
+            self.discover(auth=kwargs.get("auth"), headers=kwargs.get("headers"))
+        return super().request(method, self.resolve(url), *args, **kwargs)
+
+    def resolve(self, url_or_endpoint):
+        """Returns the absolute URL of ``url_or_endpoint``, which can be a
+        resource name, a resource name followed by a document id (like
+        ``people/<id>``), a path relative to the base URL or an absolute URL.
+        """
+        routes = self.routes
+        if routes is None:
+            routes = self.discover()
+
+        url = routes.get(url_or_endpoint)
+        if url is not None:
+            return url
+        if "://" in url_or_endpoint:
+            return url_or_endpoint
+        name, _, rest = url_or_endpoint.partition("/")
+        url = routes.get(name)
+        if url is not None:
+            return url + "/" + rest
+        return urljoin(self.settings.base_url, url_or_endpoint)
+
+    def discover(self, refresh=False, auth=None, headers=None):
+        """Discovers the routes of the remote service, unless they are
+        already known, and returns them. See :attr:`routes`.
+
+        If the home endpoint returns an error, or no valid JSON, only the
+        routes found in :any:`Settings.domain` are returned; they are not
+        persisted to the routes file.
+
+        :param refresh: Wether routes should be discovered again, ignoring
+            both the current routes and the routes file.
+        :param auth: Optional authentication for the home endpoint request,
+            as :obj:`requests.Request` takes it.
+        :param headers: Optional headers for the home endpoint request.
+        """
+        with self._routes_lock:
+            if self.routes is not None and not refresh:
+                return self.routes
+
+            routes = None if refresh else self._load_routes()
+            if routes is None:
+                try:
+                    links = self._fetch_links(auth, headers)
+                except (requests.RequestException, ValueError):
+                    routes = self._build_routes({})
+                else:
+                    routes = self._build_routes(links)
+                    self._save_routes(routes)
+            self.routes = routes
+            return routes
+
+    def _fetch_links(self, auth, headers):
+        response = super().request(
+            "GET", self.settings.base_url, auth=auth, headers=headers
+        )
+        response.raise_for_status()
+        return response.json().get(self.settings.links) or {}
+
+    def _build_routes(self, links):
+        base_url = self.settings.base_url
+        paths = {}
+        for name, resource in self.settings.domain.items():
+            paths[name] = resource.get("url", name)
+        for link in links.get("child", ()):
+            href = link.get("href", "")
+            paths[href.strip("/")] = href
+            if link.get("title"):
+                paths[link["title"]] = href
+
+        return {
+            name: urljoin(base_url, path.strip("/"))
+            for name, path in paths.items()
+            # sub-resource urls need arguments
+            if "<" not in path
+        }
+
+    def _load_routes(self):
+        if not self.routes_file or not os.path.exists(self.routes_file):
+            return None
+        with open(self.routes_file, encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("base_url") != self.settings.base_url:
+            return None
+        return data["routes"]
 
-        return super().post(url, json=json, **kwargs)
+    def _save_routes(self, routes):
+        if not self.routes_file:
+            return
+        temp = self.routes_file + ".tmp"
+        with open(temp, "w", encoding="utf-8") as f:
+            json.dump({"base_url": self.settings.base_url, "routes": routes}, f)
+        os.replace(temp, self.routes_file)
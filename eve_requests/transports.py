@@ -0,0 +1,167 @@
+import io
+import sys
+from urllib.parse import unquote, urlsplit
+
+from requests import Response
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+
+class WSGITransport(BaseAdapter):
+    """Sends requests straight to a WSGI application, like an Eve_ (Flask)
+    app, in the same process. No socket is involved, so requests are served
+    at memory speed. Useful for integration tests and for batch jobs running
+    alongside the service.
+
+    Transports follow the :class:`requests.adapters.BaseAdapter` interface,
+    thus any adapter (like the default :class:`requests.adapters.HTTPAdapter`
+    or a third-party HTTP/2 adapter) can be passed to :class:`Client`.
+
+        >>> from eve import Eve
+        >>> app = Eve(settings='settings.py')
+        >>> client = Client(settings, transport=WSGITransport(app))
+        >>> client.post('contacts', {'name': 'john'})
+        <Response [201]>
+
+    .. _Eve:
+       http://python-eve.org/
+
+    :param app: The WSGI application.
+    :param environ: Optional dict of extra WSGI environment variables, added
+        to each request.
+    """
+
+    def __init__(self, app, environ=None):
+        super().__init__()
+
+        #: The WSGI application.
+        self.app = app
+
+        #: Extra WSGI environment variables, added to each request.
+        self.environ = environ or {}
+
+    def send(
+        self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None
+    ):
+        """Sends a :class:`requests.PreparedRequest` to the application and
+        returns a :class:`requests.Response`. Arguments other than ``request``
+        and ``stream`` are accepted for compatibility and ignored."""
+        # pylint: disable=too-many-arguments
+        state = {}
+
+        def start_response(status, headers, exc_info=None):
+            if exc_info and state:
+                raise exc_info[1].with_traceback(exc_info[2])
+            state["status"] = status
+            state["headers"] = headers
+
+        result = self.app(self._environ(request), start_response)
+        body = _IterStream(result)
+        if not stream:
+            content = body.read()
+            body.close()
+            body = io.BytesIO(content)
+        elif "status" not in state:
+            # applications may defer start_response to the first iteration
+            body.prime()
+
+        return self.build_response(request, state["status"], state["headers"], body)
+
+    def build_response(self, request, status, headers, body):
+        """Builds a :class:`requests.Response` out of a WSGI response."""
+        response = Response()
+        code, _, reason = status.partition(" ")
+        response.status_code = int(code)
+        response.reason = reason
+        response.headers = CaseInsensitiveDict(headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.raw = body
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
+
+    def close(self):
+        pass
+
+    def _environ(self, request):
+        url = urlsplit(request.url)
+        https = url.scheme == "https"
+        environ = {
+            "REQUEST_METHOD": request.method,
+            "SCRIPT_NAME": "",
+            "PATH_INFO": unquote(url.path) or "/",
+            "QUERY_STRING": url.query,
+            "SERVER_NAME": url.hostname or "localhost",
+            "SERVER_PORT": str(url.port or (443 if https else 80)),
+            "SERVER_PROTOCOL": "HTTP/1.1",
+            "REMOTE_ADDR": "127.0.0.1",
+            "wsgi.version": (1, 0),
+            "wsgi.url_scheme": url.scheme or "http",
+            "wsgi.input": self._input(request.body),
+            "wsgi.errors": sys.stderr,
+            "wsgi.multithread": True,
+            "wsgi.multiprocess": False,
+            "wsgi.run_once": False,
+        }
+        for name, value in request.headers.items():
+            key = name.upper().replace("-", "_")
+            if key not in ("CONTENT_TYPE", "CONTENT_LENGTH"):
+                key = "HTTP_" + key
+            environ[key] = value
+        environ.update(self.environ)
+        return environ
+
+    @staticmethod
+    def _input(body):
+        if body is None:
+            return io.BytesIO()
+        if isinstance(body, str):
+            return io.BytesIO(body.encode("utf-8"))
+        if isinstance(body, bytes):
+            return io.BytesIO(body)
+        if hasattr(body, "read"):
+            # streamed bodies, like media.MultipartEncoder
+            return body
+        return _IterStream(body)
+
+
+class _IterStream(io.RawIOBase):
+    """Read-only file-like view of an iterable of bytes."""
+
+    def __init__(self, iterable):
+        super().__init__()
+        self._iterable = iterable
+        self._iterator = iter(iterable)
+        self._buffer = b""
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            data = self._buffer + b"".join(self._iterator)
+            self._buffer = b""
+            return data
+
+        while len(self._buffer) < size:
+            chunk = next(self._iterator, None)
+            if chunk is None:
+                break
+            self._buffer += chunk
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+    def prime(self):
+        self._buffer += next(self._iterator, b"")
+
+    def readinto(self, buffer):
+        data = self.read(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+    def close(self):
+        if hasattr(self._iterable, "close"):
+            self._iterable.close()
+        super().close()
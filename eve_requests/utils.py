@@ -1,7 +1,7 @@
 from .server import Settings
 
 
-def get_documents(json, settings=None):
+def get_documents(json, settings=None, record_class=None):
     """Returns the documents contained within a JSON response. Standard server
     responses are quite information-rich; thus they contain serveral meta-fields:
     
@@ -17,9 +17,23 @@ def get_documents(json, settings=None):
         >>> get_documents(r.json())
         [{'_id': '5b89b1b091a5d0000495f54e', 'lastname': 'Green', ...}]
 
+    Large result sets can be turned into compact records instead of dicts
+    (see :func:`eve_requests.records.record_class`):
+
+        >>> get_documents(r.json(), record_class=Person)
+        [Person({'_id': '5b89b1b091a5d0000495f54e', 'lastname': 'Green', ...})]
+
+    Note that the documents are decoded as dicts first, thus peak memory is
+    higher than with dicts alone. To save memory, decode responses straight
+    into records with :func:`eve_requests.records.records_hook`, or with the
+    ``record_class`` argument of :meth:`Client.iter_pages`.
+
     :param json: The dict that should be parsed. 
     :param settings: Optional :any:`Settings` instance to be used while
         processing ``json``. 
+    :param record_class: Optional :class:`eve_requests.records.Record`
+        subclass used to hold the returned documents. Documents which already
+        are instances of it are returned as they are.
 
     :raises ValueError: If ``json`` does not contain a :any:`Settings.items` key.
     """
@@ -27,7 +41,14 @@ def get_documents(json, settings=None):
         settings = Settings()
 
     if settings.items in json:
-        return json[settings.items]
+        documents = json[settings.items]
+        if record_class:
+            from_dict = record_class.from_dict
+            return [
+                document if type(document) is record_class else from_dict(document)
+                for document in documents
+            ]
+        return documents
 
     raise ValueError("json does not contatin a '{0}' key".format(settings.items))
 
@@ -54,3 +75,90 @@ def purge_document(document, settings=None):
         for (key, value) in document.items()
         if key not in settings.meta_fields
     }
+
+
+def diff_document(original, document, settings=None, remove_missing=False):
+    """Returns the changes needed to turn ``original`` into ``document``,
+    suitable for a delta PATCH request. Only keys whose value has changed are
+    included. Meta fields are ignored.
+
+        >>> original = {'_id': '5b89...', 'name': 'john', 'address': {'city': 'Rome', 'zip': '00100'}}
+        >>> document = {'_id': '5b89...', 'name': 'john', 'address': {'city': 'Milan', 'zip': '00100'}}
+        >>> diff_document(original, document)
+        {'address': {'city': 'Milan'}}
+
+    Nested dicts are diffed recursively, so that only the changed subfields
+    are sent over. This relies on the remote service merging nested documents
+    on PATCH, which is Eve's default behaviour. If
+    :any:`Settings.merge_nested_documents` is disabled, changed nested dicts
+    are returned whole.
+
+    Keys missing from ``document`` are left out, so that ``document`` can
+    hold only part of the fields. Set ``remove_missing`` to send them as
+    ``None`` instead, which Eve (and :class:`eve_requests.validation.Validator`)
+    only accepts for ``nullable`` fields.
+
+    :param original: The document as it was last fetched from the service.
+    :param document: The updated document.
+    :param settings: Optional :any:`Settings` instance to be used while
+        processing the documents.
+    :param remove_missing: Wether keys of ``original`` missing from
+        ``document`` should be set to ``None``.
+    """
+    if not settings:
+        settings = Settings()
+
+    return _diff(
+        purge_document(original, settings),
+        purge_document(document, settings),
+        settings.merge_nested_documents,
+        remove_missing,
+    )
+
+
+def _diff(original, document, recursive, remove_missing):
+    changes = {}
+    for key, value in document.items():
+        if key not in original:
+            changes[key] = value
+            continue
+
+        old_value = original[key]
+        if old_value == value:
+            continue
+        if recursive and isinstance(value, dict) and isinstance(old_value, dict):
+            nested = _diff(old_value, value, recursive, remove_missing)
+            if nested:
+                changes[key] = nested
+        else:
+            changes[key] = value
+
+    if remove_missing:
+        for key in original:
+            if key not in document:
+                changes[key] = None
+
+    return changes
+
+
+def submit_windowed(executor, function, items, size, pending):
+    """Submits ``function(item)`` to ``executor`` for each of ``items``,
+    keeping at most ``size`` calls in flight, and yields ``(item, future)``
+    tuples in input order. Items are consumed lazily.
+
+    Items which were submitted but not yet yielded are kept in ``pending``,
+    a :class:`collections.deque`, so that the caller can cancel or complete
+    them if the iteration is interrupted.
+
+    :param executor: A :class:`concurrent.futures.Executor`.
+    :param function: The callable to run for each item.
+    :param items: An iterable of items.
+    :param size: Maximum number of pending calls.
+    :param pending: The deque holding the pending ``(item, future)`` tuples.
+    """
+    for item in items:
+        pending.append((item, executor.submit(function, item)))
+        if len(pending) >= size:
+            yield pending.popleft()
+    while pending:
+        yield pending.popleft()
@@ -0,0 +1,417 @@
+import re
+from collections.abc import Mapping
+from datetime import datetime
+
+from .server import Settings
+
+_OBJECTID = re.compile(r"[0-9a-fA-F]{24}\Z")
+
+#: Type checks, keyed by schema type. Types which are not listed (like
+#: ``media`` or the GeoJSON types) are not checked.
+TYPES = {
+    "string": lambda value: isinstance(value, str),
+    "integer": lambda value: isinstance(value, int),
+    "float": lambda value: isinstance(value, (int, float)),
+    "number": lambda value: isinstance(value, (int, float))
+    and not isinstance(value, bool),
+    "boolean": lambda value: isinstance(value, bool),
+    "dict": lambda value: isinstance(value, Mapping),
+    "list": lambda value: isinstance(value, (list, tuple)),
+    "objectid": lambda value: isinstance(value, str)
+    and _OBJECTID.match(value) is not None,
+}
+
+
+class ValidationError(ValueError):
+    """Raised when a document does not validate against its schema.
+
+    :param issues: The validation issues, as returned by
+        :meth:`Validator.validate`. A list of them for bulk payloads.
+    """
+
+    def __init__(self, issues):
+        super().__init__("Document is not valid: {0}".format(issues))
+
+        #: The validation issues, in the same format as Eve's ``_issues``.
+        self.issues = issues
+
+
+class Validator:
+    """Validates documents against a resource schema, on the client side, so
+    that invalid payloads are caught before they are sent over to the remote
+    service.
+
+    The schema is compiled once, when the validator is created, to a set of
+    checks per field, so that validating a document is cheap enough to be
+    done for every document of a bulk load::
+
+        >>> validator = Validator(settings.domain['contacts']['schema'])
+        >>> validator.validate({'name': 1, 'age': 20})
+        {'name': 'must be of string type'}
+
+    The following rules are supported: ``type``, ``required``,
+    ``nullable``, ``empty``, ``readonly``, ``allowed``, ``minlength``,
+    ``maxlength``, ``min``, ``max``, ``regex``, ``schema`` and
+    ``valueschema`` (or ``valuesrules``). Other rules, like ``unique`` and
+    ``data_relation``, need the database and are left to the remote service.
+    Meta fields (see :any:`Settings.meta_fields`) are never reported as
+    unknown, and required fields with a ``default`` are never reported as
+    missing.
+
+    :param schema: The resource schema, as in Eve's ``DOMAIN`` setting.
+    :param settings: Optional :class:`Settings` instance. Its
+        ``date_format`` is used to check ``datetime`` strings.
+    :param allow_unknown: Wether fields which are not in the schema are
+        allowed.
+    """
+
+    def __init__(self, schema, settings=None, allow_unknown=False):
+        self.settings = settings or Settings()
+
+        #: Wether fields which are not in the schema are allowed.
+        self.allow_unknown = allow_unknown
+
+        self._check = self._compile_schema(schema, allow_unknown)
+
+    @classmethod
+    def from_openapi(cls, document, name, settings=None):
+        """Returns a validator for a schema defined in an OpenAPI (Swagger)
+        document, like the one Eve-Swagger generates.
+
+        :param document: The OpenAPI document, as a dict.
+        :param name: Name of the schema definition, either in
+            ``components/schemas`` or ``definitions``.
+        :param settings: Optional :class:`Settings` instance.
+
+        :raises ValueError: If the definition is missing.
+        """
+        definitions = document.get("components", {}).get("schemas") or document.get(
+            "definitions", {}
+        )
+        if name not in definitions:
+            raise ValueError("Schema '{0}' is not defined".format(name))
+        definition = _resolve_ref(definitions[name], definitions)
+        return cls(
+            _openapi_schema(definition, definitions),
+            settings,
+            allow_unknown=bool(definition.get("additionalProperties", False)),
+        )
+
+    def validate(self, document, update=False):
+        """Returns the validation issues of ``document``, in the same format
+        as Eve's ``_issues``: a dict mapping each invalid field to a message,
+        a list of messages or, for subdocuments, a dict of issues. The dict is
+        empty if the document is valid.
+
+        :param document: The document to validate.
+        :param update: Wether ``document`` is the payload of a PATCH request,
+            in which case missing required fields are not reported.
+        """
+        return self._check(document, update)
+
+    def is_valid(self, document, update=False):
+        """Returns wether ``document`` is valid. See :meth:`validate`."""
+        return not self._check(document, update)
+
+    def _compile_schema(self, schema, allow_unknown):
+        fields = {name: self._compile_field(rules) for name, rules in schema.items()}
+        # the service fills in defaults before validating
+        required = [
+            name
+            for name, rules in schema.items()
+            if rules.get("required") and "default" not in rules
+        ]
+        ignored = frozenset(self.settings.meta_fields)
+
+        def check(document, update):
+            issues = {}
+            for name, value in document.items():
+                field = fields.get(name)
+                if field is None:
+                    if not allow_unknown and name not in ignored:
+                        issues[name] = "unknown field"
+                    continue
+                issue = field(value, update)
+                if issue:
+                    issues[name] = issue
+            if not update:
+                for name in required:
+                    if name not in document:
+                        issues[name] = "required field"
+            return issues
+
+        return check
+
+    def _compile_field(self, rules):
+        # pylint: disable=too-many-locals
+        nullable = rules.get("nullable", False)
+        readonly = rules.get("readonly", False)
+        type_name, type_check = self._compile_type(rules.get("type"))
+        checks = _compile_rules(rules)
+
+        nested = None
+        schema = rules.get("schema")
+        types = rules.get("type")
+        types = set(types) if isinstance(types, (list, tuple)) else {types}
+        if schema and "list" in types and "dict" in types:
+            # the schema applies either to items or to fields, depending on
+            # the value; it is left to the remote service
+            pass
+        elif schema and "list" in types:
+            nested = _items(self._compile_field(schema))
+        elif schema and all(isinstance(value, Mapping) for value in schema.values()):
+            nested = _subdocument(
+                self._compile_schema(schema, rules.get("allow_unknown", False))
+            )
+        values_rules = rules.get("valueschema") or rules.get("valuesrules")
+        if values_rules:
+            nested = _values(self._compile_field(values_rules))
+
+        def check_type(value, update):
+            # pylint: disable=unused-argument
+            if value is None:
+                return None if nullable else "null value not allowed"
+            if readonly:
+                return "field is read-only"
+            if type_check and not type_check(value):
+                return "must be of {0} type".format(type_name)
+            return None
+
+        if not checks and not nested:
+            # most fields only have a type
+            return check_type
+
+        def check(value, update):
+            issue = check_type(value, update)
+            if issue or value is None:
+                return issue
+            issues = [message for message in (c(value) for c in checks) if message]
+            if nested:
+                issue = nested(value, update)
+                if issue:
+                    issues.append(issue)
+            if not issues:
+                return None
+            return issues[0] if len(issues) == 1 else issues
+
+        return check
+
+    def _compile_type(self, type_name):
+        if isinstance(type_name, (list, tuple)):
+            type_checks = [self._compile_type(name)[1] for name in type_name]
+            if not all(type_checks):
+                return None, None
+            return (
+                " or ".join(type_name),
+                lambda value: any(check(value) for check in type_checks),
+            )
+        if type_name == "datetime":
+            date_format = self.settings.date_format
+
+            def is_datetime(value):
+                if isinstance(value, datetime):
+                    return True
+                try:
+                    datetime.strptime(value, date_format)
+                except (TypeError, ValueError):
+                    return False
+                return True
+
+            return type_name, is_datetime
+        return type_name, TYPES.get(type_name)
+
+
+def validator_for(settings, endpoint):
+    """Returns a :class:`Validator` for the resource served at ``endpoint``,
+    as defined in ``settings.domain``.
+
+    :param settings: The :class:`Settings` instance holding the domain.
+    :param endpoint: The resource name or url.
+
+    :raises ValueError: If no resource with a schema matches ``endpoint``.
+    """
+    endpoint = endpoint.strip("/")
+    for name, resource in settings.domain.items():
+        if endpoint in (name, resource.get("url", name).strip("/")):
+            if "schema" in resource:
+                return Validator(
+                    resource["schema"],
+                    settings,
+                    allow_unknown=resource.get("allow_unknown", False),
+                )
+    raise ValueError("No schema defined for endpoint '{0}'".format(endpoint))
+
+
+def _compile_rules(rules):
+    checks = []
+
+    if rules.get("empty") is False:
+        checks.append(
+            lambda value: (
+                "empty values not allowed"
+                if isinstance(value, (str, list, tuple, Mapping)) and not value
+                else None
+            )
+        )
+
+    allowed = rules.get("allowed")
+    if allowed is not None:
+        allowed = set(allowed)
+
+        def check_allowed(value):
+            if isinstance(value, (list, tuple)):
+                unallowed = [item for item in value if item not in allowed]
+                return "unallowed values {0}".format(unallowed) if unallowed else None
+            try:
+                ok = value in allowed
+            except TypeError:
+                ok = False
+            return None if ok else "unallowed value {0}".format(value)
+
+        checks.append(check_allowed)
+
+    for rule, compare, message in (
+        ("minlength", lambda length, limit: length < limit, "min length is {0}"),
+        ("maxlength", lambda length, limit: length > limit, "max length is {0}"),
+    ):
+        if rule in rules:
+            checks.append(_length_check(rules[rule], compare, message))
+
+    for rule, compare, message in (
+        ("min", lambda value, limit: value < limit, "min value is {0}"),
+        ("max", lambda value, limit: value > limit, "max value is {0}"),
+    ):
+        if rule in rules:
+            checks.append(_value_check(rules[rule], compare, message))
+
+    if "regex" in rules:
+        pattern = re.compile(rules["regex"] + r"\Z")
+        message = "value does not match regex '{0}'".format(rules["regex"])
+        checks.append(
+            lambda value: (
+                message if isinstance(value, str) and not pattern.match(value) else None
+            )
+        )
+
+    return checks
+
+
+def _length_check(limit, compare, message):
+    message = message.format(limit)
+
+    def check(value):
+        try:
+            return message if compare(len(value), limit) else None
+        except TypeError:
+            return None
+
+    return check
+
+
+def _value_check(limit, compare, message):
+    message = message.format(limit)
+
+    def check(value):
+        try:
+            return message if compare(value, limit) else None
+        except TypeError:
+            return None
+
+    return check
+
+
+def _subdocument(check_document):
+    def check(value, update):
+        if not isinstance(value, Mapping):
+            return None
+        return check_document(value, update)
+
+    return check
+
+
+def _items(field):
+    def check(value, update):
+        if not isinstance(value, (list, tuple)):
+            return None
+        issues = {}
+        for index, item in enumerate(value):
+            issue = field(item, update)
+            if issue:
+                issues[index] = issue
+        return issues
+
+    return check
+
+
+def _values(field):
+    def check(value, update):
+        if not isinstance(value, Mapping):
+            return None
+        issues = {}
+        for key, item in value.items():
+            issue = field(item, update)
+            if issue:
+                issues[key] = issue
+        return issues
+
+    return check
+
+
+_OPENAPI_TYPES = {
+    "string": "string",
+    "integer": "integer",
+    "number": "number",
+    "boolean": "boolean",
+    "object": "dict",
+    "array": "list",
+}
+
+_OPENAPI_RULES = {
+    "enum": "allowed",
+    "minLength": "minlength",
+    "maxLength": "maxlength",
+    "minItems": "minlength",
+    "maxItems": "maxlength",
+    "minimum": "min",
+    "maximum": "max",
+    "pattern": "regex",
+    "nullable": "nullable",
+    "readOnly": "readonly",
+}
+
+
+def _resolve_ref(definition, definitions):
+    while "$ref" in definition:
+        definition = definitions[definition["$ref"].rsplit("/", 1)[-1]]
+    return definition
+
+
+def _openapi_schema(definition, definitions):
+    required = set(definition.get("required", ()))
+    schema = {}
+    for name, prop in definition.get("properties", {}).items():
+        rules = _openapi_rules(prop, definitions)
+        if name in required:
+            rules["required"] = True
+        schema[name] = rules
+    return schema
+
+
+def _openapi_rules(prop, definitions):
+    prop = _resolve_ref(prop, definitions)
+    rules = {
+        rule: prop[keyword]
+        for keyword, rule in _OPENAPI_RULES.items()
+        if keyword in prop
+    }
+    type_name = _OPENAPI_TYPES.get(prop.get("type"))
+    if type_name == "string" and prop.get("format") == "date-time":
+        type_name = "datetime"
+    if type_name:
+        rules["type"] = type_name
+    if type_name == "dict" and "properties" in prop:
+        rules["schema"] = _openapi_schema(prop, definitions)
+        rules["allow_unknown"] = bool(prop.get("additionalProperties", False))
+    elif type_name == "list" and "items" in prop:
+        rules["schema"] = _openapi_rules(prop["items"], definitions)
+    return rules
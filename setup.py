@@ -15,6 +15,8 @@ INSTALL_REQUIRES = ["requests"]
 
 EXTRAS_REQUIRE = {
     "docs": ["sphinx", "alabaster"],
+    "numpy": ["numpy"],
+    "zstd": ["zstandard"],
     "tests": ["redis", "testfixtures", "pytest", "tox"],
 }
 EXTRAS_REQUIRE["dev"] = EXTRAS_REQUIRE["tests"] + EXTRAS_REQUIRE["docs"]
@@ -38,7 +40,8 @@ setup(
     test_suite="tests",
     install_requires=INSTALL_REQUIRES,
     extras_require=EXTRAS_REQUIRE,
-    python_requires="!=3.0.*,!=3.1.*,!=3.2.*,!=3.3.*",
+    entry_points={"console_scripts": ["eve-export = eve_requests.exporter:main"]},
+    python_requires=">=3.7",
     classifiers=[
         "Development Status :: 3 - Alpha",
         "Intended Audience :: Developers",
@@ -46,9 +49,7 @@ setup(
         "Operating System :: OS Independent",
         "Programming Language :: Python",
         "Programming Language :: Python :: 3",
-        "Programming Language :: Python :: 3.4",
-        "Programming Language :: Python :: 3.5",
-        "Programming Language :: Python :: 3.6",
+        "Programming Language :: Python :: 3.7",
         "Topic :: Internet :: WWW/HTTP :: Dynamic Content",
         "Topic :: Internet :: WWW/HTTP :: WSGI :: Application",
         "Topic :: Software Development :: Libraries :: Python Modules",
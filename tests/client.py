@@ -1,7 +1,12 @@
 # pylint: disable=W0212
+import json
+from urllib.parse import parse_qsl
+
 import pytest
 
 from eve_requests import Client, Settings
+from eve_requests.transports import WSGITransport
+from fakes import FakeResponse
 
 
 def test_client_session_is_set_at_startup():
@@ -270,3 +275,95 @@ def test_validate():
         client.patch("foo", {})
         client.put("foo", {})
         client.delete("foo", "etag", "id")
+
+
+def test_delta_patch_method():
+    client = Client()
+    original = {
+        client.settings.id_field: "id",
+        client.settings.etag: "etag",
+        "key": "value",
+        "other": "unchanged",
+        "nested": {"a": 1, "b": 2},
+    }
+    document = dict(original, key="new_value", nested={"a": 1, "b": 3})
+    req = client._build_patch_request("foo", document, original=original)
+    assert req.url == "http://localhost:5000/foo/id"
+    assert req.json == {"key": "new_value", "nested": {"b": 3}}
+    assert req.headers["If-Match"] == "etag"
+
+    # id and etag are inferred from the original document; fields missing
+    # from the document are left untouched, unless asked otherwise
+    document = {"key": "new_value"}
+    req = client._build_patch_request("foo", document, original=original)
+    assert req.url == "http://localhost:5000/foo/id"
+    assert req.headers["If-Match"] == "etag"
+    assert req.json == {"key": "new_value"}
+
+    req = client._build_patch_request(
+        "foo", document, original=original, remove_missing=True
+    )
+    assert req.json == {"key": "new_value", "other": None, "nested": None}
+
+    req = client._build_patch_request(
+        "foo", document, unique_id="foo_id", etag="foo_etag", original=original
+    )
+    assert req.url == "http://localhost:5000/foo/foo_id"
+    assert req.headers["If-Match"] == "foo_etag"
+
+    # nothing changed, no request is sent
+    def send(*args, **kwargs):
+        raise AssertionError("request sent")
+
+    client._prepare_and_send_request = send
+    assert client.patch("foo", dict(original), original=original) is None
+    # an empty snapshot is a snapshot too
+    assert client.patch("foo", {}, "id", "etag", original={}) is None
+
+
+def test_iter_pages():
+    client = Client()
+    calls = []
+
+    def get(endpoint, **kwargs):
+        calls.append((endpoint, kwargs))
+        page = kwargs["params"]["page"]
+        links = {"next": {"href": "foo?page=3"}} if page < 3 else {}
+        return FakeResponse(
+            {client.settings.items: [page], client.settings.links: links}
+        )
+
+    client.get = get
+    pages = list(client.iter_pages("foo", max_results=10, params={"page": 2}))
+    assert [page[client.settings.items] for page in pages] == [[2], [3]]
+    assert calls[0][1]["params"] == {"page": 2, "max_results": 10}
+    assert calls[1][1]["params"]["page"] == 3
+
+
+def test_iter_pages_without_links():
+    documents = list(range(25))
+    totals = [True]
+
+    def app(environ, start_response):
+        query = dict(parse_qsl(environ["QUERY_STRING"]))
+        page, max_results = int(query["page"]), int(query.get("max_results", 10))
+        items = documents[(page - 1) * max_results : page * max_results]
+        meta = {"page": page, "max_results": max_results}
+        if totals[0]:
+            meta["total"] = len(documents)
+        start_response("200 OK", [("Content-Type", "application/json")])
+        return [json.dumps({"_items": items, "_meta": meta}).encode()]
+
+    client = Client(transport=WSGITransport(app))
+
+    def read(**kwargs):
+        pages = client.iter_pages("foo", **kwargs)
+        return [n for page in pages for n in page["_items"]]
+
+    # pages are counted from the total
+    assert read() == documents
+
+    # or read until a page is not full
+    totals[0] = False
+    assert read(max_results=5) == documents
+    assert read() == documents
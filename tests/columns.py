@@ -0,0 +1,87 @@
+# pylint: disable=W0212
+import json
+from array import array
+
+import pytest
+
+from eve_requests import Client
+from eve_requests.columns import Columns, read_columns
+from fakes import FakeResponse
+
+DOCUMENTS = [
+    {"_id": "1", "age": 30, "score": 1.5, "_created": "Thu, 01 Jan 1970 00:00:01 GMT"},
+    {"_id": "2", "active": True, "tags": ["a"]},
+    {"_id": "3", "age": None, "score": 2, "active": False},
+]
+TYPES = {"age": "integer", "score": "float", "active": "boolean"}
+
+
+def test_columns():
+    columns = Columns(TYPES)
+    columns.extend(DOCUMENTS)
+
+    assert columns.count == 3
+    assert set(columns) == {"_id", "age", "score", "_created", "active", "tags"}
+    assert columns["_id"] == ["1", "2", "3"]
+    assert columns["age"] == array("q", [30, 0, 0])
+    assert columns.masks["age"] == bytearray([1, 0, 0])
+    assert columns["score"] == array("d", [1.5, 0, 2])
+    assert columns["_created"] == array("q", [1000, 0, 0])
+    # columns discovered late are backfilled
+    assert columns["active"] == array("b", [0, 1, 0])
+    assert columns.masks["active"] == bytearray([0, 1, 1])
+    assert columns["tags"] == [None, ["a"], None]
+
+
+def test_columns_fixed_fields():
+    columns = Columns(TYPES, fields=["age", "missing"])
+    columns.extend(DOCUMENTS)
+    assert set(columns) == {"age", "missing"}
+    assert columns["missing"] == [None, None, None]
+    assert columns.to_dict()["age"] == array("q", [30, 0, 0])
+
+
+def test_columns_to_numpy():
+    numpy = pytest.importorskip("numpy")
+    columns = Columns(TYPES)
+    columns.extend(DOCUMENTS)
+    result = columns.to_numpy()
+
+    assert result["age"].dtype == numpy.int64
+    assert result["active"].dtype == bool
+    assert result["_created"][0] == numpy.datetime64(1000, "ms")
+    assert result["tags"].dtype == object
+
+    # arrays share the column buffers, which are then frozen
+    with pytest.raises(ValueError):
+        columns.append(DOCUMENTS[0])
+
+    columns = Columns(TYPES)
+    columns.extend(DOCUMENTS)
+    result = columns.to_numpy(copy=True)
+    columns.append(DOCUMENTS[0])
+    assert len(result["age"]) == len(DOCUMENTS)
+    assert len(columns["age"]) == len(DOCUMENTS) + 1
+
+
+def test_read_columns():
+    client = Client()
+    client.settings.domain = {"people": {"schema": {"age": {"type": "integer"}}}}
+    calls = []
+
+    def get(endpoint, **kwargs):
+        params = kwargs["params"]
+        calls.append(params)
+        page = {
+            client.settings.items: [DOCUMENTS[params["page"] - 1]],
+            client.settings.links: {},
+        }
+        if params["page"] < len(DOCUMENTS):
+            page[client.settings.links] = {"next": {"href": "people?page=2"}}
+        return FakeResponse(page)
+
+    client.get = get
+    columns = read_columns(client, "people", fields=["age"])
+    assert columns["age"] == array("q", [30, 0, 0])
+    assert len(calls) == 3
+    assert json.loads(calls[0]["projection"]) == {"age": 1}
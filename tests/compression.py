@@ -0,0 +1,60 @@
+# pylint: disable=W0212
+import gzip
+import json
+import zlib
+
+import pytest
+
+from eve_requests import Client
+from eve_requests.compression import compress
+from eve_requests.transports import WSGITransport
+
+
+def test_compress():
+    data = b"eve" * 1000
+    assert gzip.decompress(compress(data, "gzip")) == data
+    assert zlib.decompress(compress(data, "deflate", 1)) == data
+
+    with pytest.raises(ValueError):
+        compress(data, "zip")
+
+
+def test_compress_zstd():
+    zstandard = pytest.importorskip("zstandard")
+    data = b"eve" * 1000
+    assert zstandard.ZstdDecompressor().decompress(compress(data, "zstd")) == data
+
+
+def test_client_compresses_request_bodies():
+    requests = []
+
+    def app(environ, start_response):
+        body = environ["wsgi.input"].read(int(environ.get("CONTENT_LENGTH") or 0))
+        requests.append((environ, body))
+        start_response("200 OK", [])
+        return [b""]
+
+    client = Client(transport=WSGITransport(app))
+    client.compress = "gzip"
+    client.compress_threshold = 100
+
+    payload = [{"name": "john doe", "n": n} for n in range(50)]
+    client.post("contacts", payload)
+    environ, body = requests[-1]
+    assert environ["HTTP_CONTENT_ENCODING"] == "gzip"
+    assert int(environ["CONTENT_LENGTH"]) == len(body)
+    assert json.loads(gzip.decompress(body)) == payload
+
+    client.post("contacts", {"name": "john"})
+    environ, body = requests[-1]
+    assert "HTTP_CONTENT_ENCODING" not in environ
+    assert json.loads(body) == {"name": "john"}
+
+    client.get("contacts")
+    environ, _ = requests[-1]
+    assert "gzip" in environ["HTTP_ACCEPT_ENCODING"]
+
+    client.accept_encoding = "identity"
+    client.get("contacts")
+    environ, _ = requests[-1]
+    assert environ["HTTP_ACCEPT_ENCODING"] == "identity"
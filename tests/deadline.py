@@ -0,0 +1,115 @@
+import json
+import time
+
+import pytest
+from requests.adapters import BaseAdapter
+from requests.exceptions import Timeout
+
+from eve_requests import Client
+from eve_requests.deadline import Deadline, DeadlineExceeded
+from eve_requests.governor import Governor
+from eve_requests.transports import WSGITransport
+
+
+class RecordingTransport(BaseAdapter):
+    """Records the timeout of each request, then answers like a paginated
+    Eve endpoint."""
+
+    def __init__(self, delay=0.0, status="200 OK", headers=None):
+        super().__init__()
+        self.timeouts = []
+        self.delay = delay
+        self.status = status
+        self.headers = headers or []
+        self.wsgi = WSGITransport(self.app)
+
+    def app(self, environ, start_response):
+        time.sleep(self.delay)
+        start_response(self.status, self.headers)
+        return [json.dumps({"_items": [], "_links": {"next": {}}}).encode()]
+
+    def send(self, request, **kwargs):  # pylint: disable=W0221
+        self.timeouts.append(kwargs.get("timeout"))
+        return self.wsgi.send(request, **kwargs)
+
+    def close(self):
+        pass
+
+
+def test_deadline():
+    deadline = Deadline(10)
+    assert 9 < deadline.remaining <= 10
+    assert not deadline.expired
+    assert deadline.timeout(1) == 1
+    assert 9 < deadline.timeout() <= 10
+    assert deadline.timeout((1, None))[0] == 1
+    assert 9 < deadline.timeout((1, None))[1] <= 10
+
+    assert Deadline.of(None) is None
+    assert Deadline.of(deadline) is deadline
+    assert isinstance(Deadline.of(5), Deadline)
+
+    deadline = Deadline(0)
+    assert deadline.expired
+    with pytest.raises(Timeout):
+        deadline.timeout()
+
+
+def test_client_timeout_and_deadline():
+    transport = RecordingTransport()
+    client = Client(transport=transport)
+
+    client.get("contacts", timeout=3)
+    assert transport.timeouts[-1] == 3
+
+    client.post("contacts", {"name": "john"}, deadline=Deadline(2))
+    assert 1 < transport.timeouts[-1] <= 2
+
+    with pytest.raises(DeadlineExceeded):
+        client.get("contacts", deadline=Deadline(0))
+    assert len(transport.timeouts) == 2
+
+    # a number of seconds applies to the single call
+    client.get("contacts", deadline=2)
+    assert 1 < transport.timeouts[-1] <= 2
+
+
+def test_deadline_spans_pagination():
+    transport = RecordingTransport(delay=0.03)
+    client = Client(transport=transport)
+
+    pages = 0
+    with pytest.raises(DeadlineExceeded):
+        for _ in client.iter_pages("contacts", deadline=0.1):
+            pages += 1
+    assert 2 <= pages <= 4
+    assert transport.timeouts == sorted(transport.timeouts, reverse=True)
+
+
+def test_deadline_spans_retries():
+    transport = RecordingTransport(
+        status="503 SERVICE UNAVAILABLE", headers=[("Retry-After", "5")]
+    )
+    governor = Governor(retries=3)
+    client = Client(transport=transport, governor=governor)
+
+    start = time.monotonic()
+    with pytest.raises(DeadlineExceeded):
+        client.post("contacts", {"name": "john"}, deadline=Deadline(1))
+    # the Retry-After pause can't fit in the deadline, so we fail early
+    assert time.monotonic() - start < 0.5
+    assert len(transport.timeouts) == 1
+    assert governor.in_flight == 0
+
+
+def test_deadline_spans_bulk_post():
+    transport = RecordingTransport(delay=0.03)
+    client = Client(transport=transport)
+
+    documents = ({"n": n} for n in range(100))
+    with pytest.raises(DeadlineExceeded):
+        for _ in client.bulk_post(
+            "contacts", documents, batch_size=1, max_workers=1, deadline=0.1
+        ):
+            pass
+    assert len(transport.timeouts) < 10
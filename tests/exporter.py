@@ -0,0 +1,132 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from eve_requests import Settings
+from eve_requests.exporter import export, main
+
+TOTAL = 23
+
+
+class Handler(BaseHTTPRequestHandler):
+    #: sort parameters received
+    sorts = set()
+
+    def do_GET(self):  # pylint: disable=C0103
+        query = parse_qs(urlsplit(self.path).query)
+        page, max_results = int(query["page"][0]), int(query["max_results"][0])
+        Handler.sorts.update(query.get("sort", [None]))
+        start = (page - 1) * max_results
+        items = [
+            {"_id": n, "name": "é%d" % n}
+            for n in range(start, min(TOTAL, start + max_results))
+        ]
+        # documents added meanwhile
+        total = TOTAL + 1 if "where" in query else TOTAL
+        body = json.dumps({"_items": items, "_meta": {"total": total}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):  # pylint: disable=W0221
+        pass
+
+
+@pytest.fixture(name="base_url")
+def fixture_base_url():
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield "http://127.0.0.1:{0}".format(server.server_port)
+    server.shutdown()
+
+
+def read_partitions(directory, manifest, opener=open):
+    ids = []
+    for partition in manifest["partitions"]:
+        path = os.path.join(directory, partition["file"])
+        with open(path, "rb") as f:
+            content = f.read()
+        assert len(content) == partition["bytes"]
+        assert hashlib.sha256(content).hexdigest() == partition["sha256"]
+        with opener(path, "rt", encoding="utf-8") as f:
+            documents = [json.loads(line) for line in f]
+        assert len(documents) == partition["count"]
+        ids += [document["_id"] for document in documents]
+    return ids
+
+
+def test_export(base_url, tmp_path):
+    directory = str(tmp_path)
+    manifest = export(
+        Settings(base_url), "people", directory, processes=2, max_results=5
+    )
+
+    assert manifest["count"] == manifest["total"] == TOTAL
+    assert len(manifest["partitions"]) == 5
+    assert read_partitions(directory, manifest) == list(range(TOTAL))
+    with open(os.path.join(directory, "manifest.json")) as f:
+        assert json.load(f) == manifest
+
+
+def test_export_compressed(base_url, tmp_path):
+    directory = str(tmp_path)
+    manifest = export(
+        Settings(base_url),
+        "people",
+        directory,
+        processes=1,
+        partitions=2,
+        max_results=10,
+        compress="gzip",
+    )
+    assert [p["file"] for p in manifest["partitions"]] == [
+        "part-00000.ndjson.gz",
+        "part-00001.ndjson.gz",
+    ]
+    assert read_partitions(directory, manifest, gzip.open) == list(range(TOTAL))
+
+    with pytest.raises(ValueError):
+        export(Settings(base_url), "people", directory, compress="zip")
+
+
+def test_export_command(base_url, tmp_path, capsys):
+    assert (
+        main(
+            [base_url, "people", str(tmp_path), "--processes", "1", "--compress", "xz"]
+        )
+        == 0
+    )
+    assert "23 documents exported" in capsys.readouterr().out
+
+
+def test_export_sort_and_completeness(base_url, tmp_path):
+    Handler.sorts.clear()
+    manifest = export(Settings(base_url), "people", str(tmp_path), processes=1)
+    assert manifest["complete"]
+    assert Handler.sorts == {"_id"}
+
+    Handler.sorts.clear()
+    manifest = export(
+        Settings(base_url),
+        "people",
+        str(tmp_path),
+        processes=1,
+        params={"sort": "-name", "where": "{}"},
+    )
+    assert Handler.sorts == {"-name"}
+    assert manifest["count"] == TOTAL
+    assert not manifest["complete"]
+
+    code = main(
+        [base_url, "people", str(tmp_path), "--processes", "1", "--where", "{}"]
+    )
+    assert code == 1
@@ -0,0 +1,23 @@
+class FakeResponse:
+    """Stands in for a :class:`requests.Response`, holding either decoded
+    JSON data or raw content."""
+
+    def __init__(self, json_data=None, content=b""):
+        self.json_data = json_data
+        self.content = content
+        self.headers = {"Content-Length": str(len(content))}
+        self.closed = False
+
+    def json(self, **kwargs):
+        # pylint: disable=unused-argument
+        return self.json_data
+
+    def iter_content(self, chunk_size):
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start : start + chunk_size]
+
+    def raise_for_status(self):
+        pass
+
+    def close(self):
+        self.closed = True
@@ -0,0 +1,158 @@
+# pylint: disable=W0212
+import json
+import time
+from email.utils import formatdate
+
+from eve_requests import Client, Settings
+from eve_requests.governor import Governor, TokenBucket, parse_retry_after
+from eve_requests.transports import WSGITransport
+
+
+def test_token_bucket():
+    bucket = TokenBucket(100, burst=1)
+    start = time.monotonic()
+    for _ in range(6):
+        bucket.acquire()
+    assert time.monotonic() - start >= 0.045
+
+
+def test_governor_aimd():
+    governor = Governor(initial_limit=4, max_limit=5, tolerance=2.0)
+
+    for _ in range(20):
+        governor.acquire()
+        governor.release(latency=0.01, status_code=200)
+    assert governor.limit == 5
+    assert governor.in_flight == 0
+    assert governor.baselines == {None: 0.01}
+
+    governor.acquire()
+    governor.release(latency=0.01, status_code=429)
+    assert governor.limit == 2.5
+
+    # a single overload per round trip
+    governor.acquire()
+    governor.release(latency=1, status_code=503)
+    assert governor.limit == 2.5
+
+    governor._decreased = 0
+    governor.acquire()
+    governor.release(latency=1, status_code=200)
+    assert governor.limit == 1.25
+
+    governor._decreased = 0
+    governor.acquire()
+    governor.release(latency=1, status_code=None)
+    assert governor.limit == 1
+
+
+def test_governor_baselines():
+    governor = Governor(initial_limit=4, tolerance=2.0)
+
+    # fast errors and fast endpoints don't lower the baseline of others
+    for endpoint, latency, status_code in (
+        ("contacts", 0.1, 201),
+        ("contacts", 0.001, 422),
+        ("invoices", 0.001, 200),
+        ("contacts", 0.15, 201),
+    ):
+        governor.acquire(endpoint)
+        governor.release(endpoint, latency, status_code)
+    assert governor.baselines["invoices"] == 0.001
+    assert 0.1 < governor.baselines["contacts"] < 0.11
+    assert governor.limit > 4
+
+
+def test_governor_retry_delay():
+    governor = Governor(retry_backoff=0.1, max_retry_after=0.3)
+    assert 0.05 <= governor.retry_delay(0) <= 0.1
+    assert 0.1 <= governor.retry_delay(1) <= 0.2
+    assert 0.15 <= governor.retry_delay(5) <= 0.3
+
+
+def test_governor_retry_after():
+    governor = Governor()
+    governor.acquire()
+    governor.release(latency=0.01, status_code=429, retry_after="0.05")
+
+    start = time.monotonic()
+    governor.acquire()
+    assert time.monotonic() - start >= 0.04
+
+
+def test_parse_retry_after():
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("junk") is None
+    assert parse_retry_after("12") == 12
+    assert 50 < parse_retry_after(formatdate(time.time() + 60, usegmt=True)) <= 60
+    assert parse_retry_after(formatdate(time.time() - 60, usegmt=True)) == 0
+
+
+def test_client_retries_overloaded_requests():
+    statuses = ["429 TOO MANY REQUESTS", "503 SERVICE UNAVAILABLE", "201 CREATED"]
+    seen = []
+
+    def app(environ, start_response):
+        seen.append(environ["PATH_INFO"])
+        start_response(statuses[len(seen) - 1], [("Retry-After", "0")])
+        return [b""]
+
+    governor = Governor(rates={"contacts": 1000})
+    client = Client(
+        Settings("http://myapi"), transport=WSGITransport(app), governor=governor
+    )
+    assert client.post("contacts", {"name": "john"}).status_code == 201
+    assert seen == ["/contacts"] * 3
+    assert governor.in_flight == 0
+    assert list(governor._buckets) == ["contacts"]
+
+    # give up after governor.retries
+    seen.clear()
+    statuses[:] = ["429 TOO MANY REQUESTS"] * 10
+    governor.retries = 1
+    assert client.post("contacts", {"name": "john"}).status_code == 429
+    assert len(seen) == 2
+
+
+def test_client_backs_off_without_retry_after():
+    seen = []
+
+    def app(environ, start_response):
+        seen.append(time.monotonic())
+        start_response("503 SERVICE UNAVAILABLE", [])
+        return [b""]
+
+    governor = Governor(retries=3, retry_backoff=0.02)
+    client = Client(
+        Settings("http://myapi"), transport=WSGITransport(app), governor=governor
+    )
+    assert client.get("contacts").status_code == 503
+    assert len(seen) == 4
+    # at least half of 0.02, 0.04 and 0.08 seconds
+    assert seen[-1] - seen[0] >= 0.07
+
+
+def test_bulk_post():
+    def app(environ, start_response):
+        body = environ["wsgi.input"].read(int(environ["CONTENT_LENGTH"]))
+        start_response("201 CREATED", [("Content-Type", "application/json")])
+        return [json.dumps({"_items": json.loads(body)}).encode()]
+
+    client = Client(transport=WSGITransport(app), governor=Governor())
+    documents = ({"n": n} for n in range(25))
+    results = list(client.bulk_post("contacts", documents, batch_size=10))
+
+    assert [len(batch) for batch, _ in results] == [10, 10, 5]
+    assert [r.json()["_items"] for _, r in results] == [b for b, _ in results]
+
+
+def test_acquire_timeout():
+    bucket = TokenBucket(1, burst=1)
+    assert bucket.acquire(0)
+    assert not bucket.acquire(0.1)
+
+    governor = Governor(initial_limit=1)
+    assert governor.acquire(timeout=0.01)
+    assert not governor.acquire(timeout=0.01)
+    governor.cancel()
+    assert governor.in_flight == 0
@@ -0,0 +1,132 @@
+import io
+import json
+
+import pytest
+
+from eve_requests import Client
+from eve_requests.importer import Importer, read_csv, read_ndjson
+from eve_requests.transports import WSGITransport
+from eve_requests.validation import Validator
+
+
+class BulkApp:
+    """Mimics Eve bulk inserts: if any document is invalid, none is stored."""
+
+    def __init__(self):
+        self.stored = []
+
+    def __call__(self, environ, start_response):
+        body = environ["wsgi.input"].read(int(environ["CONTENT_LENGTH"]))
+        documents = json.loads(body)
+        items = [
+            (
+                {"_status": "ERR", "_issues": {"name": "required field"}}
+                if "name" not in document
+                else {"_status": "OK"}
+            )
+            for document in documents
+        ]
+        if any(item["_status"] == "ERR" for item in items):
+            status = "422 UNPROCESSABLE ENTITY"
+        else:
+            status = "201 CREATED"
+            self.stored.extend(documents)
+        start_response(status, [("Content-Type", "application/json")])
+        return [json.dumps({"_status": "OK", "_items": items}).encode()]
+
+
+def test_read_ndjson_and_csv(tmp_path):
+    path = tmp_path / "data.ndjson"
+    path.write_text('{"a": 1}\n\n{"a": 2}\n')
+    assert list(read_ndjson(str(path))) == [{"a": 1}, {"a": 2}]
+
+    source = io.StringIO("a,b\n1,2\n3,4\n")
+    assert list(read_csv(source)) == [{"a": "1", "b": "2"}, {"a": "3", "b": "4"}]
+
+
+def test_import_with_rejects(tmp_path):
+    app = BulkApp()
+    client = Client(transport=WSGITransport(app))
+    records = [{"name": str(n), "_id": n} for n in range(20)]
+    records[7] = {"other": 7}
+
+    rejects = tmp_path / "rejects.ndjson"
+    importer = Importer(
+        client,
+        "contacts",
+        batch_size=4,
+        max_workers=2,
+        purge=True,
+        rejects=str(rejects),
+    )
+    result = importer.run(iter(records))
+
+    assert result.records == 20
+    assert result.inserted == 19
+    assert result.rejected == 1
+    assert result.records_per_second > 0
+    assert result.peak_memory
+    assert sorted(int(d["name"]) for d in app.stored) == [
+        n for n in range(20) if n != 7
+    ]
+    assert all("_id" not in d for d in app.stored)
+
+    reject = json.loads(rejects.read_text())
+    assert reject == {"record": {"other": 7}, "_issues": {"name": "required field"}}
+
+
+def test_import_resumes_from_checkpoint(tmp_path):
+    app = BulkApp()
+    client = Client(transport=WSGITransport(app))
+    records = [{"name": str(n)} for n in range(30)]
+    checkpoint = str(tmp_path / "import.ckpt")
+
+    def interrupt(record):
+        if record["name"] == "17":
+            raise RuntimeError("interrupted")
+        return record
+
+    importer = Importer(
+        client, "contacts", batch_size=5, checkpoint=checkpoint, transform=interrupt
+    )
+    with pytest.raises(RuntimeError):
+        importer.run(records)
+    # batches not yet sent when interrupted are cancelled, the others are
+    # saved to the checkpoint
+    stored = len(app.stored)
+    assert stored in (10, 15)
+    with open(checkpoint) as f:
+        assert json.load(f) == {"done": [[0, stored]]}
+
+    importer.transform = None
+    result = importer.run(records)
+    assert result.skipped == stored
+    assert result.inserted == 30 - stored
+    assert sorted(int(d["name"]) for d in app.stored) == list(range(30))
+
+
+def test_import_with_validator(tmp_path):
+    app = BulkApp()
+    client = Client(transport=WSGITransport(app))
+    records = [{"name": str(n)} for n in range(10)]
+    records[3] = {"name": 3}
+    records[8] = {"other": 8}
+
+    rejects = tmp_path / "rejects.ndjson"
+    validator = Validator({"name": {"type": "string", "required": True}})
+    importer = Importer(
+        client, "contacts", batch_size=4, rejects=str(rejects), validator=validator
+    )
+    result = importer.run(records)
+
+    assert result.inserted == 8
+    assert result.rejected == 2
+    # invalid records are never sent
+    assert len(app.stored) == 8
+    assert [json.loads(line) for line in rejects.read_text().splitlines()] == [
+        {"record": {"name": 3}, "_issues": {"name": "must be of string type"}},
+        {
+            "record": {"other": 8},
+            "_issues": {"other": "unknown field", "name": "required field"},
+        },
+    ]
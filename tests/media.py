@@ -0,0 +1,109 @@
+# pylint: disable=W0212
+import io
+import json
+import mmap
+from email.parser import BytesParser
+
+from eve_requests import Client
+from eve_requests.media import MultipartEncoder, stream_to
+from fakes import FakeResponse
+
+
+def parse(body):
+    data = body.read(7)
+    while True:
+        chunk = body.read(7)
+        if not chunk:
+            break
+        data += chunk
+    message = BytesParser().parsebytes(
+        b"Content-Type: " + body.content_type.encode() + b"\r\n\r\n" + data
+    )
+    return {
+        part.get_param("name", header="content-disposition"): part
+        for part in message.get_payload()
+    }
+
+
+def test_multipart_encoder():
+    progress = []
+    content = b"\x00\x01binary" * 1000
+    body = MultipartEncoder(
+        {"name": "john", "age": 30},
+        {
+            "avatar": ("avatar.png", io.BytesIO(content)),
+            "resume": ("resume", io.BytesIO(b"text"), "text/plain"),
+        },
+        callback=lambda read, total: progress.append((read, total)),
+    )
+    length = len(body)
+
+    parts = parse(body)
+    assert parts["name"].get_payload() == "john"
+    assert parts["age"].get_payload() == "30"
+    assert parts["avatar"].get_filename() == "avatar.png"
+    assert parts["avatar"].get_content_type() == "image/png"
+    assert parts["avatar"].get_payload(decode=True) == content
+    assert parts["resume"].get_content_type() == "text/plain"
+
+    assert body.bytes_read == length
+    assert progress[-1] == (length, length)
+    assert body.read(10) == b""
+
+
+def test_multipart_encoder_as_json():
+    body = MultipartEncoder({"name": "john"}, as_json=True)
+    assert parse(body)["name"].get_payload() == json.dumps("john")
+
+
+def test_multipart_encoder_mmap(tmp_path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(b"x" * 10000)
+
+    with open(str(path), "rb") as f:
+        body = MultipartEncoder(files={"file": f})
+        assert parse(body)["file"].get_filename() == "data.bin"
+
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        body = MultipartEncoder(files={"file": ("data.bin", mapped)})
+        expected = len(body)
+        assert parse(body)["file"].get_payload(decode=True) == b"x" * 10000
+        assert body.bytes_read == expected
+        mapped.close()
+
+
+def test_media_request():
+    client = Client()
+    with io.BytesIO(b"content") as f:
+        req = client._build_media_request(
+            "POST",
+            "contacts",
+            {client.settings.id_field: "id", "name": "john"},
+            {"avatar": f},
+        )
+        assert req.url == "http://localhost:5000/contacts"
+        assert req.headers["Content-Type"] == req.data.content_type
+        prepared = client.session.prepare_request(req)
+        assert prepared.headers["Content-Length"] == str(len(req.data))
+        assert "name" in parse(req.data)
+
+    req = client._build_media_request(
+        "PATCH", "contacts", {"name": "john"}, {}, unique_id="id", etag="etag"
+    )
+    assert req.url == "http://localhost:5000/contacts/id"
+    assert req.headers["If-Match"] == "etag"
+    assert req.method == "PATCH"
+
+
+def test_stream_to(tmp_path):
+    progress = []
+    response = FakeResponse(content=b"y" * 100)
+    buffer = io.BytesIO()
+    assert stream_to(response, buffer, 30, lambda *args: progress.append(args)) == 100
+    assert buffer.getvalue() == b"y" * 100
+    assert progress == [(30, 100), (60, 100), (90, 100), (100, 100)]
+    assert response.closed
+
+    path = tmp_path / "media.bin"
+    assert stream_to(FakeResponse(content=b"z" * 10), str(path)) == 10
+    assert path.read_bytes() == b"z" * 10
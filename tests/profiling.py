@@ -0,0 +1,106 @@
+import json
+import time
+
+import pytest
+
+from eve_requests import Client, Settings
+from eve_requests.profiling import Profiler
+from eve_requests.transports import WSGITransport
+
+
+def app(environ, start_response):
+    start_response("200 OK", [("Content-Type", "application/json")])
+    return [json.dumps({"_items": [{"name": "john"}]}).encode("utf-8")]
+
+
+def new_client(profiler):
+    client = Client(Settings("http://myapi"), transport=WSGITransport(app))
+    client.profiler = profiler
+    return client
+
+
+def test_profiler_stages():
+    profiler = Profiler(allocations=True)
+    client = new_client(profiler)
+    document = {"_id": "id", "_etag": "etag", "name": "john"}
+
+    client.get("contacts").json()
+    client.put("contacts", document)
+    client.patch("people", document, original=dict(document, name="jane"))
+    profiler.stop()
+
+    stages = {
+        (endpoint, ";".join(path)): values
+        for (endpoint, path), values in profiler.stats.items()
+    }
+    assert set(stages) == {
+        ("contacts", "build"),
+        ("contacts", "build;resolve_url"),
+        ("contacts", "build;resolve_etag"),
+        ("contacts", "build;purge"),
+        ("contacts", "prepare"),
+        ("contacts", "send"),
+        ("contacts", "decode"),
+        ("people", "build"),
+        ("people", "build;resolve_url"),
+        ("people", "build;resolve_etag"),
+        ("people", "build;diff"),
+        ("people", "prepare"),
+        ("people", "send"),
+    }
+    count, wall, cpu, _, self_wall, _, _ = stages[("contacts", "build")]
+    assert count == 2
+    assert wall >= self_wall > 0
+    assert cpu > 0
+    assert stages[("contacts", "build;resolve_url")][0] == 2
+    assert stages[("contacts", "decode")][0] == 1
+
+    report = profiler.report()
+    assert "build;resolve_url" in report
+    assert "contacts  client" in report
+
+
+def test_profiler_window():
+    profiler = Profiler(window=0.05)
+    client = new_client(profiler)
+    client.get("contacts")
+    time.sleep(0.1)
+    client.get("contacts")
+    assert profiler.stats[("contacts", ("send",))][0] == 1
+    assert not profiler.active
+
+    profiler.reset()
+    client.get("contacts")
+    assert profiler.stats[("contacts", ("send",))][0] == 1
+
+
+def test_profiler_write_collapsed(tmp_path):
+    profiler = Profiler()
+    client = new_client(profiler)
+    client.get("contacts").json()
+
+    path = str(tmp_path / "stacks.txt")
+    profiler.write_collapsed(path, metric="cpu")
+    with open(path) as f:
+        lines = [line.rsplit(" ", 1) for line in f.read().splitlines()]
+    assert {stack for stack, _ in lines} <= {
+        "contacts;build",
+        "contacts;build;resolve_url",
+        "contacts;prepare",
+        "contacts;send",
+        "contacts;decode",
+    }
+    assert all(int(value) > 0 for _, value in lines)
+
+    with pytest.raises(ValueError):
+        profiler.write_collapsed(path, metric="other")
+
+
+def test_profiler_keys_stages_by_endpoint():
+    profiler = Profiler()
+    client = Client(Settings("http://x/api/"), transport=WSGITransport(app))
+    client.profiler = profiler
+    client.get("v1/people").json()
+
+    assert {endpoint for endpoint, _ in profiler.stats} == {"v1/people"}
+    assert "v1/people  client" in profiler.report()
@@ -0,0 +1,119 @@
+# pylint: disable=W0212
+import json as jsonlib
+
+import pytest
+
+from eve_requests import Client, Settings
+from eve_requests.records import record_class, records_hook
+from eve_requests.transports import WSGITransport
+from eve_requests.utils import get_documents, purge_document
+
+SCHEMA = {"name": {"type": "string"}, "age": {"type": "integer"}, "keys": {}}
+
+
+def test_record_class():
+    Contact = record_class(SCHEMA, "Contact")
+    assert Contact.__name__ == "Contact"
+    assert Contact._fields[-3:] == ("name", "age", "keys")
+
+    document = {"_id": "id", "name": "john", "keys": [1, 2], "unknown": {"a": 1}}
+    record = Contact.from_dict(document)
+    assert not hasattr(record, "__dict__")
+    assert record.name == "john"
+    assert record["keys"] == [1, 2]
+    assert record["unknown"] == {"a": 1}
+    assert "age" not in record
+    assert len(record) == 4
+    assert record.to_dict() == document
+    assert record == document
+
+    with pytest.raises(KeyError):
+        record["age"]  # pylint: disable=W0104
+
+    record["age"] = 30
+    del record["name"]
+    del record["unknown"]
+    assert record.to_dict() == {"_id": "id", "keys": [1, 2], "age": 30}
+
+    with pytest.raises(KeyError):
+        del record["name"]
+
+    assert Contact(name="jane")["name"] == "jane"
+
+
+def test_record_class_custom_meta_fields():
+    settings = Settings()
+    settings.id_field = "id"
+    Contact = record_class(["name", "id", "not-an-identifier"], settings=settings)
+    assert Contact._fields.count("id") == 1
+
+    record = Contact.from_dict({"id": 1, "not-an-identifier": 2})
+    assert record._extra is None
+    assert record.to_dict() == {"id": 1, "not-an-identifier": 2}
+
+
+def test_get_documents_as_records():
+    Contact = record_class(SCHEMA)
+    json = {"_items": [{"_id": "1", "name": "john"}, {"_id": "2", "age": 3}]}
+    records = get_documents(json, record_class=Contact)
+    assert all(isinstance(record, Contact) for record in records)
+    assert [record.to_dict() for record in records] == json["_items"]
+
+
+def test_records_hook():
+    Contact = record_class(SCHEMA)
+    body = jsonlib.dumps(
+        {
+            "_items": [
+                {
+                    "_id": "1",
+                    "name": "john",
+                    "_links": {"self": {"href": "contacts/1"}},
+                    "friend": {"_id": "2", "name": "jane"},
+                    "keys": [{"_id": "3"}, {"_id": "4"}],
+                },
+                {"_id": "5", "age": 3},
+            ],
+            "_meta": {"total": 2},
+        }
+    )
+    page = jsonlib.loads(body, object_pairs_hook=records_hook(Contact))
+    assert type(page) is dict
+    records = get_documents(page, record_class=Contact)
+    assert records == page["_items"]
+    assert [type(record) for record in records] == [Contact, Contact]
+    assert records[0]["_links"] == {"self": {"href": "contacts/1"}}
+    # embedded documents are plain dicts
+    assert type(records[0]["friend"]) is dict
+    assert [type(key) for key in records[0]["keys"]] == [dict, dict]
+    assert [record.to_dict() for record in records] == jsonlib.loads(body)["_items"]
+
+
+def test_iter_pages_as_records():
+    def app(environ, start_response):
+        start_response("200 OK", [("Content-Type", "application/json")])
+        return [b'{"_items": [{"_id": "1", "name": "john"}], "_links": {}}']
+
+    Contact = record_class(SCHEMA)
+    client = Client(transport=WSGITransport(app))
+    pages = list(client.iter_pages("contacts", record_class=Contact))
+    assert len(pages) == 1
+    assert type(pages[0]["_items"][0]) is Contact
+    assert pages[0]["_items"][0].name == "john"
+
+
+def test_write_records():
+    client = Client()
+    Contact = record_class(SCHEMA)
+    record = Contact.from_dict({"_id": "id", "_etag": "etag", "name": "john"})
+
+    assert purge_document(record) == {"name": "john"}
+
+    req = client._build_post_request("contacts", record)
+    assert req.json == record.to_dict()
+    assert isinstance(req.json, dict)
+
+    req = client._build_put_request("contacts", record)
+    assert req.url == "http://localhost:5000/contacts/id"
+    assert req.headers["If-Match"] == "etag"
+    assert req.json == {"name": "john"}
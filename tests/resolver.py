@@ -0,0 +1,82 @@
+# pylint: disable=W0212
+import json
+
+from eve_requests import Client, ReferenceResolver
+from fakes import FakeResponse
+
+
+def fake_get(client, store, calls):
+    def get(endpoint, **kwargs):
+        calls.append((endpoint, kwargs["params"]))
+        where = json.loads(kwargs["params"]["where"])
+        ids = where[client.settings.id_field]["$in"]
+        items = [store[unique_id] for unique_id in ids if unique_id in store]
+        return FakeResponse({client.settings.items: items})
+
+    return get
+
+
+def test_resolve_references():
+    client = Client()
+    store = {str(i): {"_id": str(i), "name": "contact %d" % i} for i in range(5)}
+    calls = []
+    client.get = fake_get(client, store, calls)
+
+    resolver = ReferenceResolver(client, batch_size=2)
+    documents = [
+        {"contact": "0"},
+        {"contact": "1"},
+        {"contact": "0"},
+        {"contact": ["2", "3", "missing"]},
+        {"contact": None},
+        {"contact": {"_id": "4"}},
+        {},
+    ]
+    resolver.resolve(documents, "contact", "contacts")
+
+    assert documents[0]["contact"] == store["0"]
+    assert documents[1]["contact"] == store["1"]
+    assert documents[2]["contact"] == store["0"]
+    assert documents[3]["contact"] == [store["2"], store["3"], "missing"]
+    assert documents[4]["contact"] is None
+    assert documents[5]["contact"] == {"_id": "4"}
+    assert "contact" not in documents[6]
+
+    # five unique ids, two per request
+    assert len(calls) == 3
+    assert calls[0][1]["max_results"] == 2
+
+    # cached references are not requested again
+    calls.clear()
+    resolver.resolve([{"contact": "0"}, {"contact": "4"}], "contact", "contacts")
+    assert len(calls) == 1
+    assert json.loads(calls[0][1]["where"])["_id"]["$in"] == ["4"]
+
+
+def test_resolver_cache_is_bounded():
+    client = Client()
+    store = {str(i): {"_id": str(i)} for i in range(5)}
+    client.get = fake_get(client, store, [])
+
+    resolver = ReferenceResolver(client, cache_size=2)
+    resolver.fetch("contacts", ["0", "1", "2"])
+    assert list(resolver._cache) == [("contacts", "1"), ("contacts", "2")]
+
+    resolver.clear()
+    assert not resolver._cache
+
+
+def test_get_embedded():
+    client = Client()
+    calls = []
+
+    def get(endpoint, **kwargs):
+        calls.append((endpoint, kwargs["params"]))
+        return FakeResponse({client.settings.items: [{"contact": {"_id": "0"}}]})
+
+    client.get = get
+    resolver = ReferenceResolver(client)
+    documents = resolver.get_embedded("invoices", "contact", params={"page": 2})
+    assert documents == [{"contact": {"_id": "0"}}]
+    assert json.loads(calls[0][1]["embedded"]) == {"contact": 1}
+    assert calls[0][1]["page"] == 2
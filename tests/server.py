@@ -15,3 +15,25 @@ def test_settings_defaults():
     assert settings.id_field == "_id"
     assert settings.created == "_created"
     assert settings.links == "_links"
+
+
+def test_settings_from_file(tmp_path):
+    path = tmp_path / "settings.py"
+    path.write_text(
+        "SERVER_NAME = 'myapi.com'\n"
+        "URL_PREFIX = 'api'\n"
+        "API_VERSION = 'v1'\n"
+        "IF_MATCH = False\n"
+        "ID_FIELD = 'id'\n"
+        "DOMAIN = {'contacts': {'schema': {'name': {'type': 'string'}}}}\n"
+    )
+    settings = Settings.from_file(str(path))
+
+    assert settings.base_url == "http://myapi.com/api/v1/"
+    assert settings.if_match is False
+    assert settings.id_field == "id"
+    assert settings.etag == "_etag"
+    assert settings.domain == {"contacts": {"schema": {"name": {"type": "string"}}}}
+
+    settings = Settings.from_file(str(path), base_url="https://other.com")
+    assert settings.base_url == "https://other.com"
@@ -0,0 +1,125 @@
+import json
+
+from eve_requests import Session, Settings
+from eve_requests.transports import WSGITransport
+
+
+class HomeApp:
+    """Mimics an Eve service with HATEOAS enabled."""
+
+    def __init__(self):
+        self.home_requests = 0
+
+    def __call__(self, environ, start_response):
+        path = environ["PATH_INFO"]
+        if path.endswith("/"):
+            self.home_requests += 1
+            content = {
+                "_links": {
+                    "child": [
+                        {"href": "people", "title": "people"},
+                        {"href": "v1/contacts", "title": "contacts"},
+                        {"href": "users/<regex('[a-f0-9]{24}'):user>/invoices"},
+                    ]
+                }
+            }
+        else:
+            content = {"method": environ["REQUEST_METHOD"], "path": path}
+        start_response("200 OK", [("Content-Type", "application/json")])
+        return [json.dumps(content).encode("utf-8")]
+
+
+def new_session(app, **kwargs):
+    session = Session(Settings("http://myapi/api/"), **kwargs)
+    session.mount("http://", WSGITransport(app))
+    return session
+
+
+def test_session_resolves_routes():
+    app = HomeApp()
+    session = new_session(app)
+
+    assert session.get("contacts").json() == {
+        "method": "GET",
+        "path": "/api/v1/contacts",
+    }
+    assert session.patch("contacts/id", json={}).json() == {
+        "method": "PATCH",
+        "path": "/api/v1/contacts/id",
+    }
+    assert session.post("v1/contacts", json={}).json()["path"] == "/api/v1/contacts"
+    assert session.delete("people/id").json()["path"] == "/api/people/id"
+    assert session.get("other").json()["path"] == "/api/other"
+    assert session.get("http://myapi/direct").json()["path"] == "/direct"
+    # routes are discovered once
+    assert app.home_requests == 1
+    assert "users" not in session.routes
+
+
+def test_session_routes_from_domain():
+    app = HomeApp()
+    session = new_session(app)
+    session.settings.domain = {"invoices": {"url": "billing/invoices"}}
+
+    assert session.resolve("invoices") == "http://myapi/api/billing/invoices"
+    assert session.resolve("people") == "http://myapi/api/people"
+
+
+def test_session_routes_file(tmp_path):
+    routes_file = str(tmp_path / "routes.json")
+    app = HomeApp()
+    routes = new_session(app, routes_file=routes_file).discover()
+    assert routes["contacts"] == "http://myapi/api/v1/contacts"
+
+    session = new_session(app, routes_file=routes_file)
+    assert session.resolve("contacts") == "http://myapi/api/v1/contacts"
+    assert app.home_requests == 1
+
+    session.discover(refresh=True)
+    assert app.home_requests == 2
+
+    # routes persisted for another service are ignored
+    session = new_session(app, routes_file=routes_file)
+    session.settings.base_url = "http://myapi/other/"
+    session.discover()
+    assert app.home_requests == 3
+
+
+def test_session_discovery_with_auth():
+    app = HomeApp()
+
+    def protected(environ, start_response):
+        if "HTTP_AUTHORIZATION" not in environ:
+            app.home_requests += environ["PATH_INFO"].endswith("/")
+            start_response("401 UNAUTHORIZED", [("Content-Type", "application/json")])
+            return [b"{}"]
+        return app(environ, start_response)
+
+    session = new_session(protected)
+    response = session.get("contacts", auth=("user", "pw"))
+    assert response.json()["path"] == "/api/v1/contacts"
+    assert app.home_requests == 1
+
+
+def test_session_discovery_failure():
+    app = HomeApp()
+
+    def broken(environ, start_response):
+        if environ["PATH_INFO"].endswith("/"):
+            app.home_requests += 1
+            start_response("401 UNAUTHORIZED", [("Content-Type", "application/json")])
+            return [b"{}"]
+        return app(environ, start_response)
+
+    session = new_session(broken)
+    session.settings.domain = {"invoices": {"url": "billing/invoices"}}
+    # names are resolved relative to the base url, and discovery is not
+    # attempted again
+    assert session.get("contacts").json()["path"] == "/api/contacts"
+    assert session.get("invoices").json()["path"] == "/api/billing/invoices"
+    assert app.home_requests == 1
+
+    session = new_session(broken)
+    session.routes = {"people": "http://myapi/api/v2/people"}
+    assert session.get("people").json()["path"] == "/api/v2/people"
+    assert app.home_requests == 1
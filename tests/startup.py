@@ -0,0 +1,38 @@
+import subprocess
+import sys
+
+import eve_requests
+
+
+def imported_modules(statement):
+    code = "import sys; {0}; print(' '.join(sys.modules))".format(statement)
+    output = subprocess.check_output([sys.executable, "-c", code])
+    return output.decode().split()
+
+
+def test_import_does_not_load_requests():
+    modules = imported_modules(
+        "import eve_requests, eve_requests.utils; from eve_requests import Settings"
+    )
+    assert "eve_requests" in modules
+    assert "requests" not in modules
+    assert "urllib3" not in modules
+
+
+def test_client_is_loaded_on_first_use():
+    modules = imported_modules("from eve_requests import Client")
+    assert "requests" in modules
+
+    from eve_requests.client import Client
+
+    assert eve_requests.Client is Client
+    assert "Client" in dir(eve_requests)
+
+
+def test_unknown_attribute():
+    try:
+        eve_requests.foo  # pylint: disable=W0104
+    except AttributeError as e:
+        assert "foo" in str(e)
+    else:
+        assert False
@@ -0,0 +1,101 @@
+import json
+
+from eve_requests import Client, Settings
+from eve_requests.traffic import Recorder, Replayer, ReplayResult, read_log
+from eve_requests.transports import WSGITransport
+
+
+def make_app(seen):
+    def app(environ, start_response):
+        length = int(environ.get("CONTENT_LENGTH") or 0)
+        body = environ["wsgi.input"].read(length) if length else b""
+        seen.append((environ["REQUEST_METHOD"], environ["PATH_INFO"], body))
+        status = "201 CREATED" if environ["REQUEST_METHOD"] == "POST" else "200 OK"
+        start_response(status, [])
+        return [b"{}"]
+
+    return app
+
+
+def test_record_and_replay(tmp_path):
+    log = str(tmp_path / "traffic.log")
+    client = Client(Settings("http://myapi/v1"), transport=WSGITransport(make_app([])))
+    client.recorder = Recorder(log, bodies=True)
+    client.get("contacts", params={"page": 2})
+    client.post("contacts", {"name": "john"})
+    client.recorder.close()
+
+    entries = list(read_log(log))
+    assert [e["method"] for e in entries] == ["GET", "POST"]
+    assert entries[0]["path"] == "contacts"
+    assert entries[0]["query"] == "page=2"
+    assert entries[0]["size"] == 0
+    assert entries[0]["status"] == 200
+    assert entries[1]["size"] == len(json.dumps({"name": "john"}))
+    assert json.loads(entries[1]["body"]) == {"name": "john"}
+    assert entries[0]["start"] <= entries[1]["start"]
+
+    seen = []
+    target = Client(
+        Settings("http://staging/v1"), transport=WSGITransport(make_app(seen))
+    )
+    result = Replayer(target, speed=10, concurrency=2).run(log)
+    assert result.count == 2
+    assert result.statuses == {200: 1, 201: 1}
+    assert sorted(seen) == [
+        ("GET", "/contacts", b""),
+        ("POST", "/contacts", b'{"name": "john"}'),
+    ]
+    assert "2 requests" in result.report()
+
+
+def test_replay_relative_to_base_url(tmp_path):
+    log = str(tmp_path / "traffic.log")
+    seen = []
+    client = Client(
+        Settings("http://myapi/v1/"), transport=WSGITransport(make_app(seen))
+    )
+    client.recorder = Recorder(log)
+    client.get("contacts")
+    client.recorder.close()
+    assert next(read_log(log))["path"] == "contacts"
+
+    target = Client(
+        Settings("http://staging/v2/"), transport=WSGITransport(make_app(seen))
+    )
+    Replayer(target).run(log)
+    assert [path for _, path, _ in seen] == ["/v1/contacts", "/v2/contacts"]
+
+
+def test_replay_errors(tmp_path):
+    log = tmp_path / "traffic.log"
+    log.write_text('[0,"GET","contacts","",0,0.01,200]\n')
+
+    def app(environ, start_response):
+        raise RuntimeError("boom")
+
+    client = Client(transport=WSGITransport(app))
+    result = Replayer(client).run(str(log))
+    assert result.statuses == {None: 1}
+    assert result.errors == {"RuntimeError": 1}
+    assert "errors RuntimeError: 1" in result.report()
+
+
+def test_replay_placeholder_bodies(tmp_path):
+    log = tmp_path / "traffic.log"
+    log.write_text('[0,"POST","/contacts","",40,0.01,201]\n')
+
+    seen = []
+    client = Client(transport=WSGITransport(make_app(seen)))
+    Replayer(client).run(str(log))
+    assert len(seen[0][2]) == 40
+    assert "_padding" in json.loads(seen[0][2])
+
+
+def test_replay_result_percentiles():
+    result = ReplayResult()
+    result.latencies = [n / 1000.0 for n in range(1, 101)]
+    assert result.percentile(50) == 0.05
+    assert result.percentile(99) == 0.099
+    assert result.percentile(100) == 0.1
+    assert ReplayResult().percentile(50) is None
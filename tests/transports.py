@@ -0,0 +1,71 @@
+import io
+import json
+
+from eve_requests import Client, Settings
+from eve_requests.transports import WSGITransport
+
+
+def echo_app(environ, start_response):
+    length = int(environ.get("CONTENT_LENGTH") or 0)
+    body = environ["wsgi.input"].read(length) if length else b""
+    content = json.dumps(
+        {
+            "method": environ["REQUEST_METHOD"],
+            "path": environ["PATH_INFO"],
+            "query": environ["QUERY_STRING"],
+            "host": environ["SERVER_NAME"],
+            "content_type": environ.get("CONTENT_TYPE"),
+            "if_match": environ.get("HTTP_IF_MATCH"),
+            "body": body.decode("utf-8"),
+        }
+    ).encode("utf-8")
+    start_response(
+        "201 CREATED",
+        [("Content-Type", "application/json"), ("Content-Length", str(len(content)))],
+    )
+    return [content]
+
+
+def test_wsgi_transport():
+    client = Client(Settings("http://myapi"), transport=WSGITransport(echo_app))
+
+    response = client.post("contacts", {"name": "john"}, params={"a": "b"})
+    assert response.status_code == 201
+    assert response.reason == "CREATED"
+    assert response.headers["content-type"] == "application/json"
+
+    echo = response.json()
+    assert echo["method"] == "POST"
+    assert echo["path"] == "/contacts"
+    assert echo["query"] == "a=b"
+    assert echo["host"] == "myapi"
+    assert echo["content_type"] == "application/json"
+    assert json.loads(echo["body"]) == {"name": "john"}
+
+    echo = client.patch("contacts", {"name": "jane"}, "id", "etag").json()
+    assert echo["method"] == "PATCH"
+    assert echo["path"] == "/contacts/id"
+    assert echo["if_match"] == "etag"
+
+
+def test_wsgi_transport_streams():
+    chunks = []
+
+    def app(environ, start_response):
+        def generate():
+            start_response("200 OK", [("Content-Type", "application/octet-stream")])
+            chunks.append(environ["wsgi.input"].read())
+            for _ in range(3):
+                yield b"x" * 10
+
+        return generate()
+
+    client = Client(transport=WSGITransport(app))
+    with io.BytesIO(b"content") as f:
+        response = client.post_media("media", {}, {"file": f})
+    assert response.status_code == 200
+    assert b"content" in chunks[0]
+
+    buffer = io.BytesIO()
+    assert client.download("media/id", buffer, chunk_size=4) == 30
+    assert buffer.getvalue() == b"x" * 30
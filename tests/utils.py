@@ -1,5 +1,13 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
-from eve_requests.utils import purge_document, get_documents
+from eve_requests.utils import (
+    purge_document,
+    get_documents,
+    diff_document,
+    submit_windowed,
+)
 from eve_requests.server import Settings
 
 
@@ -47,3 +55,64 @@ def test_get_documents():
         ValueError, message="json does not contain a '{}' key".format(settings.items)
     ):
         challenge = get_documents(json, settings)
+
+
+def test_diff_document():
+    settings = Settings()
+    original = {
+        settings.id_field: "id",
+        settings.etag: "etag",
+        "name": "john",
+        "age": 30,
+        "address": {"city": "Rome", "zip": "00100"},
+        "tags": ["a", "b"],
+    }
+    document = {
+        settings.id_field: "id",
+        settings.etag: "etag",
+        "name": "jane",
+        "address": {"city": "Milan", "zip": "00100"},
+        "tags": ["a", "b"],
+        "email": "jane@example.com",
+    }
+
+    challenge = diff_document(original, document)
+    assert challenge == {
+        "name": "jane",
+        "address": {"city": "Milan"},
+        "email": "jane@example.com",
+    }
+
+    challenge = diff_document(original, document, remove_missing=True)
+    assert challenge["age"] is None
+
+    assert diff_document(original, dict(original)) == {}
+
+    settings.merge_nested_documents = False
+    challenge = diff_document(original, document, settings)
+    assert challenge["address"] == {"city": "Milan", "zip": "00100"}
+
+
+def test_submit_windowed():
+    pending = deque()
+    submitted = []
+
+    def items():
+        for n in range(5):
+            submitted.append(n)
+            yield n
+
+    with ThreadPoolExecutor(2) as executor:
+        results = submit_windowed(executor, lambda n: n * 2, items(), 2, pending)
+        item, future = next(results)
+        # the window is full once the first item is yielded
+        assert (item, future.result()) == (0, 0)
+        assert submitted == [0, 1]
+        assert [item for item, _ in pending] == [1]
+        assert [(item, f.result()) for item, f in results] == [
+            (1, 2),
+            (2, 4),
+            (3, 6),
+            (4, 8),
+        ]
+    assert not pending
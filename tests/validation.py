@@ -0,0 +1,205 @@
+from datetime import datetime
+
+import pytest
+
+from eve_requests import Client, Settings
+from eve_requests.validation import ValidationError, Validator, validator_for
+
+SCHEMA = {
+    "name": {"type": "string", "required": True, "minlength": 2, "maxlength": 10},
+    "age": {"type": "integer", "min": 0, "max": 150},
+    "role": {"type": "string", "allowed": ["admin", "user"]},
+    "code": {"type": "string", "regex": "[A-Z]{3}"},
+    "born": {"type": "datetime"},
+    "ref": {"type": "objectid", "nullable": True},
+    "secret": {"type": "string", "readonly": True},
+    "address": {
+        "type": "dict",
+        "schema": {"city": {"type": "string", "required": True, "empty": False}},
+    },
+    "tags": {"type": "list", "schema": {"type": "string"}},
+    "scores": {"type": "dict", "valueschema": {"type": "number"}},
+}
+
+
+def test_validate_valid_document():
+    validator = Validator(SCHEMA)
+    document = {
+        "name": "john",
+        "age": 30,
+        "role": "admin",
+        "code": "ABC",
+        "born": "Tue, 02 Apr 2013 10:29:13 GMT",
+        "ref": None,
+        "address": {"city": "Rome"},
+        "tags": ["a", "b"],
+        "scores": {"math": 7.5},
+        "_id": "50656e4538345b39dd0414f0",
+        "_etag": "etag",
+    }
+    assert validator.validate(document) == {}
+    assert validator.is_valid(document)
+    assert validator.is_valid(dict(document, born=datetime.now()))
+
+
+def test_validate_issues():
+    validator = Validator(SCHEMA)
+    issues = validator.validate(
+        {
+            "age": -1,
+            "role": "guest",
+            "code": "ABCD",
+            "born": "yesterday",
+            "ref": "foo",
+            "secret": "x",
+            "address": {"city": ""},
+            "tags": ["a", 1],
+            "scores": {"math": "A"},
+            "other": 1,
+        }
+    )
+    assert issues == {
+        "name": "required field",
+        "age": "min value is 0",
+        "role": "unallowed value guest",
+        "code": "value does not match regex '[A-Z]{3}'",
+        "born": "must be of datetime type",
+        "ref": "must be of objectid type",
+        "secret": "field is read-only",
+        "address": {"city": "empty values not allowed"},
+        "tags": {1: "must be of string type"},
+        "scores": {"math": "must be of number type"},
+        "other": "unknown field",
+    }
+
+    issues = validator.validate({"name": "a" * 11, "age": None})
+    assert issues == {"name": "max length is 10", "age": "null value not allowed"}
+
+
+def test_validate_update():
+    validator = Validator(SCHEMA)
+    assert validator.validate({"age": 20}, update=True) == {}
+    assert validator.validate({"address": {}}, update=True) == {}
+    assert validator.validate({"age": "20"}, update=True) == {
+        "age": "must be of integer type"
+    }
+
+
+def test_validate_allow_unknown():
+    validator = Validator({"name": {"type": "string"}}, allow_unknown=True)
+    assert validator.validate({"name": "john", "other": 1}) == {}
+
+
+def test_validator_from_openapi():
+    document = {
+        "components": {
+            "schemas": {
+                "Contact": {
+                    "type": "object",
+                    "required": ["name"],
+                    "properties": {
+                        "name": {"type": "string", "maxLength": 10},
+                        "born": {"type": "string", "format": "date-time"},
+                        "role": {"type": "string", "enum": ["admin", "user"]},
+                        "address": {"$ref": "#/components/schemas/Address"},
+                        "tags": {"type": "array", "items": {"type": "string"}},
+                    },
+                },
+                "Address": {
+                    "type": "object",
+                    "properties": {"city": {"type": "string"}},
+                },
+            }
+        }
+    }
+    validator = Validator.from_openapi(document, "Contact")
+    assert (
+        validator.validate({"name": "john", "address": {"city": "Rome"}, "tags": ["a"]})
+        == {}
+    )
+    assert validator.validate(
+        {"role": "guest", "address": {"city": 1}, "tags": [1], "born": "now"}
+    ) == {
+        "name": "required field",
+        "role": "unallowed value guest",
+        "address": {"city": "must be of string type"},
+        "tags": {0: "must be of string type"},
+        "born": "must be of datetime type",
+    }
+
+    with pytest.raises(ValueError):
+        Validator.from_openapi(document, "Other")
+
+
+def test_validator_for():
+    settings = Settings()
+    settings.domain = {
+        "contacts": {"schema": SCHEMA},
+        "people": {"url": "users/people", "schema": {"name": {"type": "string"}}},
+    }
+    assert validator_for(settings, "contacts").validate({}) == {
+        "name": "required field"
+    }
+    assert validator_for(settings, "users/people").validate({"name": 1}) == {
+        "name": "must be of string type"
+    }
+    with pytest.raises(ValueError):
+        validator_for(settings, "other")
+
+
+def test_client_validates_payloads():
+    client = Client()
+    client.settings.domain = {"contacts": {"schema": SCHEMA}}
+
+    # validation is opt-in
+    req = client._build_post_request("contacts", {"age": "old"})
+    assert req.json == {"age": "old"}
+
+    client.validate_payloads = True
+    with pytest.raises(ValidationError) as error:
+        client._build_post_request("contacts", {"age": "old"})
+    assert error.value.issues == {
+        "name": "required field",
+        "age": "must be of integer type",
+    }
+
+    with pytest.raises(ValidationError) as error:
+        client._build_post_request("contacts", [{"name": "john"}, {}])
+    assert error.value.issues == [{}, {"name": "required field"}]
+
+    document = {"_id": "id", "_etag": "etag", "name": "john"}
+    assert client._build_put_request("contacts", document).json == {"name": "john"}
+    with pytest.raises(ValidationError):
+        client._build_put_request("contacts", {"_id": "id", "_etag": "etag"})
+
+    req = client._build_patch_request("contacts", {"_id": "id", "_etag": "e", "age": 3})
+    assert req.json == {"age": 3}
+    with pytest.raises(ValidationError):
+        client._build_patch_request("contacts", {"_id": "id", "_etag": "e", "age": -3})
+
+
+def test_validate_required_with_default():
+    validator = Validator(
+        {
+            "name": {"type": "string"},
+            "status": {"type": "string", "required": True, "default": "new"},
+        }
+    )
+    assert validator.validate({"name": "x"}) == {}
+    assert validator.validate({"name": "x", "status": 1}) == {
+        "status": "must be of string type"
+    }
+
+
+def test_validate_multiple_types():
+    validator = Validator(
+        {
+            "either": {"type": ["list", "dict"], "schema": {"type": "string"}},
+            "tags": {"type": ["list", "string"], "schema": {"type": "string"}},
+        }
+    )
+    assert validator.validate({"either": [1], "tags": "a"}) == {}
+    assert validator.validate({"either": 1, "tags": ["a", 1]}) == {
+        "either": "must be of list or dict type",
+        "tags": {1: "must be of string type"},
+    }